@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:14
+
+import django.db.models.deletion
+import utils.common
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_dashboard_rollups(apps, schema_editor):
+    """Build the rollup of every existing project from its tasks"""
+    Project = apps.get_model("app_models", "Project")
+    DashboardRollup = apps.get_model("app_models", "DashboardRollup")
+
+    projects = Project.objects.annotate(
+        todo_tasks=Count("tasks", filter=Q(tasks__status="todo")),
+        in_progress_tasks=Count("tasks", filter=Q(tasks__status="in_progress")),
+        done_tasks=Count("tasks", filter=Q(tasks__status="done")),
+        total_estimated_time=Sum("tasks__estimated_time"),
+        total_spent_time=Sum("tasks__spent_time"),
+    )
+    DashboardRollup.objects.bulk_create(
+        [
+            DashboardRollup(
+                id=utils.common.generate_uuid(),
+                project_id=project.id,
+                owner_id=project.owner_id,
+                todo_tasks=project.todo_tasks,
+                in_progress_tasks=project.in_progress_tasks,
+                done_tasks=project.done_tasks,
+                total_estimated_time=project.total_estimated_time or 0,
+                total_spent_time=project.total_spent_time or 0,
+            )
+            for project in projects.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_models', '0003_task_estimated_time_task_spent_time_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardRollup',
+            fields=[
+                ('id', models.CharField(default=utils.common.generate_uuid, editable=False, max_length=100, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('todo_tasks', models.IntegerField(default=0)),
+                ('in_progress_tasks', models.IntegerField(default=0)),
+                ('done_tasks', models.IntegerField(default=0)),
+                ('total_estimated_time', models.IntegerField(default=0, help_text='Sum of the estimated time of the tasks in minutes')),
+                ('total_spent_time', models.IntegerField(default=0, help_text='Sum of the time spent on the tasks in minutes')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_rollups', to=settings.AUTH_USER_MODEL)),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_rollup', to='app_models.project')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(backfill_dashboard_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# The owners are backfilled by 0007 and made required by 0008: on PostgreSQL, the
+# rows updated by a migration hold deferred foreign key checks that block an ALTER
+# TABLE in the same transaction
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_models', '0005_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='owned_tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='timeentry',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='owned_time_entries', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
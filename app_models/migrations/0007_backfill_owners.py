@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:25
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_owners(apps, schema_editor):
+    """Copy the owner of the projects onto their tasks and time entries"""
+    Project = apps.get_model("app_models", "Project")
+    Task = apps.get_model("app_models", "Task")
+    TimeEntry = apps.get_model("app_models", "TimeEntry")
+
+    Task.objects.filter(owner__isnull=True).update(
+        owner_id=Subquery(
+            Project.objects.filter(id=OuterRef("project_id")).values("owner_id")[:1]
+        )
+    )
+    TimeEntry.objects.filter(owner__isnull=True).update(
+        owner_id=Subquery(
+            Task.objects.filter(id=OuterRef("task_id")).values("owner_id")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_models', '0006_owner_denormalization'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_owners, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+SEARCHED_COLUMNS = [
+    ("app_models_project", "title"),
+    ("app_models_project", "description"),
+    ("app_models_task", "title"),
+    ("app_models_task", "description"),
+]
+
+
+def index_name(table, column):
+    return f"{table.removeprefix('app_models_')}_{column}_trgm_idx"
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Index the searched columns by trigrams, on PostgreSQL only. The indexed
+    expression is the one of the `icontains` lookup: UPPER(column::text) LIKE ...
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in SEARCHED_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name(table, column)} "
+            f"ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table, column in SEARCHED_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name(table, column)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_models', '0008_owner_not_null'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
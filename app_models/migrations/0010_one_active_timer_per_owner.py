@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:26
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.utils import timezone
+
+
+def stop_duplicate_active_timers(apps, schema_editor):
+    """Stop the active timers of an owner but its latest one, as the app does"""
+    TimeEntry = apps.get_model("app_models", "TimeEntry")
+    Task = apps.get_model("app_models", "Task")
+    DashboardRollup = apps.get_model("app_models", "DashboardRollup")
+
+    owner_ids = (
+        TimeEntry.objects.filter(is_active=True)
+        .values("owner_id")
+        .annotate(active_timers=Count("id"))
+        .filter(active_timers__gt=1)
+        .values_list("owner_id", flat=True)
+    )
+    current_time = timezone.now()
+    for owner_id in list(owner_ids):
+        timers = TimeEntry.objects.filter(owner_id=owner_id, is_active=True).order_by(
+            "-start_time"
+        )
+        for timer in timers.select_related("task")[1:]:
+            # Whole minutes over days too, as TimeEntry.compute_duration
+            duration = int((current_time - timer.start_time).total_seconds() // 60)
+            TimeEntry.objects.filter(id=timer.id).update(
+                end_time=current_time, duration=duration, is_active=False
+            )
+            Task.objects.filter(id=timer.task_id).update(
+                spent_time=F("spent_time") + duration
+            )
+            DashboardRollup.objects.filter(project_id=timer.task.project_id).update(
+                total_spent_time=F("total_spent_time") + duration
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_models', '0009_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(stop_duplicate_active_timers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='timeentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('owner',), name='timeentry_one_active_per_owner'),
+        ),
+    ]
@@ -1,3 +1,5 @@
 from .project import Project
 from .task import Task
 from .time_entry import TimeEntry
+from .dashboard_rollup import DashboardRollup
+from .owner_data_version import OwnerDataVersion
@@ -0,0 +1,28 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from app_models.models.base_model import BaseModel
+from app_models.models.project import Project
+
+
+class DashboardRollup(BaseModel):
+    """Per-project task statistics of the dashboard, maintained incrementally"""
+
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, related_name="dashboard_rollup"
+    )
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="dashboard_rollups"
+    )
+    todo_tasks = models.IntegerField(default=0)
+    in_progress_tasks = models.IntegerField(default=0)
+    done_tasks = models.IntegerField(default=0)
+    total_estimated_time = models.IntegerField(
+        default=0, help_text="Sum of the estimated time of the tasks in minutes"
+    )
+    total_spent_time = models.IntegerField(
+        default=0, help_text="Sum of the time spent on the tasks in minutes"
+    )
+
+    def __str__(self):
+        return f"Dashboard rollup of {self.project_id}"
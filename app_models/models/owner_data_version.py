@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from app_models.models.base_model import BaseModel
+
+
+class OwnerDataVersion(BaseModel):
+    """
+    Version of the projects, tasks and time entries of an owner, bumped by the
+    repositories on every write (conditional GET validators of the API)
+    """
+
+    owner = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="data_version"
+    )
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Data version {self.version} of {self.owner_id}"
@@ -9,9 +9,18 @@ class Project(BaseModel):
 
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
+    # Indexed by project_owner_created_idx, whose leading column it is
     owner = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="owned_projects"
+        User, on_delete=models.CASCADE, related_name="owned_projects", db_index=False
     )
 
+    class Meta:
+        indexes = [
+            # Projects of an owner, newest first (lists and keyset pagination)
+            models.Index(
+                fields=["owner", "-created_at", "-id"], name="project_owner_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.title
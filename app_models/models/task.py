@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from django.contrib.auth.models import User
 from django.db import models
 
 from app_models.models.base_model import BaseModel
@@ -21,7 +22,34 @@ class Task(BaseModel):
     spent_time = models.IntegerField(
         default=0, help_text="Total time spent on this task in minutes"
     )
-    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="tasks")
+    # The foreign keys are indexed by the composite indexes they lead (see Meta)
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="tasks", db_index=False
+    )
+    # Denormalized owner of the project, filtering by owner without joining it
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="owned_tasks", db_index=False
+    )
+
+    class Meta:
+        indexes = [
+            # Tasks of an owner, newest first (lists and keyset pagination)
+            models.Index(
+                fields=["owner", "-created_at", "-id"], name="task_owner_created_idx"
+            ),
+            # Tasks of a project, newest first (lists and keyset pagination)
+            models.Index(
+                fields=["project", "-created_at", "-id"], name="task_project_created_idx"
+            ),
+            # Status filters and status counts of the projects tasks
+            models.Index(fields=["project", "status"], name="task_project_status_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.owner_id:
+            self.owner_id = self.project.owner_id
+
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} ({self.status})"
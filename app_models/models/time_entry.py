@@ -9,15 +9,58 @@ class TimeEntry(BaseModel):
     """Time tracking entries for tasks"""
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="time_entries")
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="time_entries")
+    # The task and owner foreign keys are indexed by the composite indexes they lead
+    # (see Meta)
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="time_entries", db_index=False
+    )
     start_time = models.DateTimeField()
     end_time = models.DateTimeField(null=True, blank=True)
     duration = models.IntegerField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # Denormalized owner of the project, filtering by owner without joining it
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="owned_time_entries",
+        db_index=False,
+    )
+
+    class Meta:
+        indexes = [
+            # Active timers are a tiny fraction of the entries: partial index only
+            models.Index(
+                fields=["task"],
+                condition=models.Q(is_active=True),
+                name="timeentry_active_task_idx",
+            ),
+            # Entries by date range (weekly summary, daily entries)
+            models.Index(fields=["task", "start_time"], name="timeentry_task_start_idx"),
+            models.Index(
+                fields=["owner", "start_time"], name="timeentry_owner_start_idx"
+            ),
+        ]
+        constraints = [
+            # A single running timer per owner, even under concurrent starts (it
+            # also indexes the active timers of the owners)
+            models.UniqueConstraint(
+                fields=["owner"],
+                condition=models.Q(is_active=True),
+                name="timeentry_one_active_per_owner",
+            ),
+        ]
+
+    @staticmethod
+    def compute_duration(start_time, end_time):
+        """Get the duration in whole minutes between two times, over days too"""
+        return int((end_time - start_time).total_seconds() // 60)
 
     def save(self, *args, **kwargs):
+        if not self.owner_id:
+            self.owner_id = self.task.owner_id
+
         if self.start_time and self.end_time and not self.duration:
-            self.duration = (self.end_time - self.start_time).seconds // 60
+            self.duration = self.compute_duration(self.start_time, self.end_time)
 
         super().save(*args, **kwargs)
     
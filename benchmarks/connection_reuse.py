@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Measure the latency of API requests with a new database connection per request,
+with persistent connections (DATABASE_CONN_MAX_AGE) and with a connection pool
+(DATABASE_POOL, PostgreSQL only).
+
+Every mode runs in its own process, configured by the same environment variables
+as the server. The requests go through the WSGI handler of Django, whose request
+signals open and release the connections exactly like under a server. The database
+must hold the test data (`python load_test_data.py`).
+
+    python benchmarks/connection_reuse.py --requests 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "connection per request": {"DATABASE_CONN_MAX_AGE": "0", "DATABASE_POOL": "false"},
+    "persistent connection": {"DATABASE_CONN_MAX_AGE": "600", "DATABASE_POOL": "false"},
+    "connection pool": {"DATABASE_CONN_MAX_AGE": "0", "DATABASE_POOL": "true"},
+}
+
+ENDPOINTS = ("/api/tasks/list/?size=5", "/api/projects/dashboard/")
+
+
+def measure(requests_count, username):
+    """Milliseconds of every request, served in this process"""
+    import django
+
+    sys.path.insert(0, BASE_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project_manager.settings")
+    django.setup()
+
+    from django.contrib.auth.models import User
+    from django.core.handlers.wsgi import WSGIHandler
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    token = str(AccessToken.for_user(User.objects.get(username=username)))
+    handler = WSGIHandler()
+
+    def request(url):
+        path, _, query = url.partition("?")
+        environ = {
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "HTTP_AUTHORIZATION": f"Bearer {token}",
+            "wsgi.input": BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        start = time.perf_counter()
+        response = handler(environ, lambda status, headers: None)
+        # Closing the response sends request_finished, which releases the connection
+        response.close()
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code != 200:
+            raise SystemExit(f"GET {url} answered {response.status_code}")
+        return elapsed
+
+    # Warm up the imports, the caches and the pool
+    for url in ENDPOINTS:
+        request(url)
+
+    return [request(ENDPOINTS[i % len(ENDPOINTS)]) for i in range(requests_count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--username", default="john_dev")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # Child process: report the latencies of one mode to the parent
+        print(json.dumps(measure(args.requests, args.username)))
+        return
+
+    engine = os.environ.get("DATABASE_ENGINE", "")
+    print(f"{args.requests} requests on {engine or 'the configured database'}\n")
+    print(f"{'mode':<24} {'mean':>10} {'p50':>10} {'p95':>10}")
+    for mode, environment in MODES.items():
+        if environment["DATABASE_POOL"] == "true" and "postgresql" not in engine:
+            print(f"{mode:<24} {'(PostgreSQL only)':>32}")
+            continue
+
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--requests", str(args.requests)]
+            + ["--username", args.username],
+            env={**os.environ, **environment},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        latencies = json.loads(output.splitlines()[-1])
+        percentiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{mode:<24} {statistics.mean(latencies):>8.2f}ms "
+            f"{percentiles[49]:>8.2f}ms {percentiles[94]:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
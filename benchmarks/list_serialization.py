@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Compare the lean list serializers (`.values()` rows) with the ModelSerializers
+(model instances) on the projects and tasks list pages, for several page sizes.
+
+Both paths must produce the same payload, this is checked before timing them.
+The dataset is generated in a transaction that is rolled back.
+
+    python benchmarks/list_serialization.py --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project_manager.settings")
+django.setup()
+
+from django.db import transaction
+
+from benchmarks.query_plans import generate_dataset
+from serializers import (
+    ProjectListSerializer,
+    ProjectsWithTaskStatistics,
+    TaskListSerializer,
+    TaskSerializer,
+)
+from webapp.projects.infrastructure.repositories import ProjectRepository
+from webapp.tasks.infrastructure.repositories import TaskRepository
+
+PAGE_SIZES = (5, 50, 500)
+
+
+def list_paths(user):
+    """(read, serialize) functions of both paths, for the projects and tasks lists"""
+    projects, tasks = ProjectRepository(), TaskRepository()
+    return {
+        "projects": {
+            "model serializer": (
+                lambda size: list(projects.get_by_owner(user)[:size]),
+                lambda rows: ProjectsWithTaskStatistics(rows, many=True).data,
+            ),
+            "lean serializer": (
+                lambda size: list(
+                    projects.get_by_owner(user, fields=ProjectListSerializer.values())[
+                        :size
+                    ]
+                ),
+                lambda rows: ProjectListSerializer(rows).data,
+            ),
+        },
+        "tasks": {
+            "model serializer": (
+                lambda size: list(tasks.get_by_user(user)[:size]),
+                lambda rows: TaskSerializer(rows, many=True).data,
+            ),
+            "lean serializer": (
+                lambda size: list(
+                    tasks.get_by_user(user, fields=TaskListSerializer.values())[:size]
+                ),
+                lambda rows: TaskListSerializer(rows).data,
+            ),
+        },
+    }
+
+
+def measure(read, serialize, size, repeat):
+    """Median milliseconds of the read and of the serialization of a page"""
+    read_times, serialize_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = read(size)
+        read_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        serialize(rows)
+        serialize_times.append(time.perf_counter() - start)
+
+    return (
+        statistics.median(read_times) * 1000,
+        statistics.median(serialize_times) * 1000,
+    )
+
+
+def check_same_payload(paths, size):
+    payloads = [
+        [dict(item) for item in serialize(read(size))] for read, serialize in paths
+    ]
+    if payloads[0] != payloads[1]:
+        raise SystemExit("The serializers disagree on the payload")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=500, help="Projects of the user")
+    parser.add_argument("--tasks", type=int, default=2, help="Tasks per project")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with transaction.atomic():
+        print("Generating dataset...")
+        user, _ = generate_dataset(1, args.projects, args.tasks, 0)
+
+        for resource, paths in list_paths(user).items():
+            check_same_payload(paths.values(), max(PAGE_SIZES))
+            print(f"\n========== {resource} list ==========")
+            print(
+                f"{'size':>6} {'path':<18} {'read':>10} {'serialize':>10} {'total':>10}"
+            )
+            for size in PAGE_SIZES:
+                for name, (read, serialize) in paths.items():
+                    read_ms, serialize_ms = measure(read, serialize, size, args.repeat)
+                    print(
+                        f"{size:>6} {name:<18} {read_ms:>8.2f}ms {serialize_ms:>8.2f}ms "
+                        f"{read_ms + serialize_ms:>8.2f}ms"
+                    )
+
+        # Never keep the dataset
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+Show the query plans of the hot repository queries with and without the indexes
+of the models, on a generated dataset.
+
+Everything runs in a transaction that is rolled back: the dataset and the dropped
+indexes are never persisted. Still, run it against a development database.
+
+    python benchmarks/query_plans.py --users 20 --projects 10 --tasks 50 --entries 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project_manager.settings")
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Value
+from django.utils import timezone
+
+from app_models.models.constant import TaskStatus
+from app_models.models.project import Project
+from app_models.models.task import Task
+from app_models.models.time_entry import TimeEntry
+from webapp.projects.infrastructure.repositories import ProjectRepository
+from webapp.tasks.infrastructure.repositories import TaskRepository, TimeEntryRepository
+
+INDEXED_MODELS = (Project, Task, TimeEntry)
+
+
+def generate_dataset(users_count, projects_count, tasks_count, entries_count):
+    """Bulk insert users owning projects, tasks and time entries"""
+    statuses = [item.value for item in TaskStatus]
+    now = timezone.now()
+    User.objects.bulk_create(
+        [User(username=f"bench_user_{i}") for i in range(users_count)]
+    )
+    users = list(User.objects.filter(username__startswith="bench_user_"))
+
+    projects = Project.objects.bulk_create(
+        [
+            Project(title=f"Project {u.id}-{i}", owner=u)
+            for u in users
+            for i in range(projects_count)
+        ],
+        batch_size=1000,
+    )
+    tasks = Task.objects.bulk_create(
+        [
+            Task(
+                title=f"Task {i}",
+                project=project,
+                owner_id=project.owner_id,
+                status=statuses[i % len(statuses)],
+                estimated_time=60,
+            )
+            for project in projects
+            for i in range(tasks_count)
+        ],
+        batch_size=1000,
+    )
+    TimeEntry.objects.bulk_create(
+        [
+            TimeEntry(
+                user_id=task.owner_id,
+                owner_id=task.owner_id,
+                task=task,
+                start_time=now - timedelta(days=i),
+                end_time=now - timedelta(days=i) + timedelta(minutes=30),
+                duration=30,
+                is_active=False,
+            )
+            for task in tasks
+            for i in range(entries_count)
+        ],
+        batch_size=1000,
+    )
+    return users[0], tasks[0]
+
+
+def hot_queries(user, task):
+    """Querysets of the hot paths, as built by the repositories"""
+    week_start = timezone.now() - timedelta(days=7)
+    return {
+        "projects list": ProjectRepository().get_by_owner(user)[:5],
+        "tasks list": TaskRepository().get_by_user(user)[:5],
+        "tasks by status": TaskRepository().get_by_user(user, {"status": "done"})[:5],
+        "task active timer": TimeEntry.objects.filter(task=task, is_active=True),
+        "user active timers": TimeEntry.objects.filter(owner=user, is_active=True),
+        "weekly entries": TimeEntry.objects.filter(
+            owner=user,
+            start_time__gte=week_start,
+            start_time__lt=week_start + timedelta(days=7),
+        ),
+        "entries of a day": TimeEntryRepository().get_by_user_and_date(
+            user, week_start.date()
+        ),
+    }
+
+
+def explain_all(label, user, task):
+    """Print the plan and the execution time of every hot query"""
+    print(f"\n========== {label} ==========")
+    # The sqlite3 module caches statements by SQL text and does not re-plan a cached
+    # EXPLAIN once an index is dropped: a per-pass alias keeps the texts distinct
+    pass_alias = "plan_" + label.lower().replace(" ", "_")
+    for name, queryset in hot_queries(user, task).items():
+        queryset = queryset.annotate(**{pass_alias: Value(1)})
+        start = time.perf_counter()
+        list(queryset)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n--- {name} ({elapsed:.2f} ms)")
+        print(queryset.explain())
+
+
+def drop_index_sql(schema_editor, model, index):
+    """SQL dropping one of the indexes declared in the Meta of a model"""
+    return schema_editor.sql_delete_index % {
+        "table": schema_editor.quote_name(model._meta.db_table),
+        "name": schema_editor.quote_name(index.name),
+    }
+
+
+def run_statements(statements):
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(str(statement))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--projects", type=int, default=10, help="Projects per user")
+    parser.add_argument("--tasks", type=int, default=50, help="Tasks per project")
+    parser.add_argument("--entries", type=int, default=5, help="Time entries per task")
+    args = parser.parse_args()
+
+    schema_editor = connection.schema_editor()
+    model_indexes = [
+        (model, index) for model in INDEXED_MODELS for index in model._meta.indexes
+    ]
+
+    with transaction.atomic():
+        print("Generating dataset...")
+        user, task = generate_dataset(args.users, args.projects, args.tasks, args.entries)
+        # Fresh statistics so the planner knows the table sizes
+        run_statements(["ANALYZE"])
+
+        explain_all("WITH INDEXES", user, task)
+
+        run_statements(
+            drop_index_sql(schema_editor, model, index) for model, index in model_indexes
+        )
+        explain_all("WITHOUT INDEXES", user, task)
+
+        # Never keep the dataset nor the dropped indexes
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
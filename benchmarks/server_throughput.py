@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""
+Compare the throughput of the hot read endpoints (lists, dashboard) served by sync
+views under a WSGI server (gunicorn sync workers) and by the async views under an
+ASGI server (uvicorn), with the same number of worker processes.
+
+The servers run against the configured database, which must hold the test data
+(`python load_test_data.py`); the requests are authenticated as --username. The gap
+grows with the database round-trip time: run it against PostgreSQL, ideally over
+the network, rather than against a local SQLite file. The WSGI side needs gunicorn
+(`pip install gunicorn`).
+
+    python benchmarks/server_throughput.py --workers 2 --concurrency 32 --requests 2000
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+# Setup Django
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "project_manager.settings")
+django.setup()
+
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+
+ENDPOINTS = (
+    "/api/projects/list/?size=20",
+    "/api/tasks/list/?size=20",
+    "/api/tasks/list/?cursor=&size=20&with_total=true",
+    "/api/projects/dashboard/",
+)
+
+
+def server_commands(workers, port):
+    """Command and extra environment of every compared server"""
+    bind = f"127.0.0.1:{port}"
+    return {
+        "WSGI (gunicorn, sync views)": (
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "project_manager.wsgi:application",
+                # Override the worker model of gunicorn.conf.py
+                "--worker-class",
+                "sync",
+                "--workers",
+                str(workers),
+                "--bind",
+                bind,
+                "--access-logfile",
+                os.devnull,
+                "--log-level",
+                "warning",
+            ],
+            {"ASYNC_VIEWS": "false"},
+        ),
+        "ASGI (uvicorn, async views)": (
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "project_manager.asgi:application",
+                "--workers",
+                str(workers),
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--log-level",
+                "warning",
+            ],
+            {"ASYNC_VIEWS": "true"},
+        ),
+    }
+
+
+def fetch(url, token):
+    """Status and milliseconds of one GET request"""
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, (time.perf_counter() - start) * 1000
+
+
+def wait_until_ready(base_url, server, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"The server exited with code {server.returncode}")
+        try:
+            urllib.request.urlopen(f"{base_url}/api/v1/docs/", timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise SystemExit("The server did not start in time")
+
+
+def load(base_url, token, concurrency, requests_count):
+    """Fire the requests on the endpoints in turn, from `concurrency` clients"""
+    urls = [base_url + ENDPOINTS[i % len(ENDPOINTS)] for i in range(requests_count)]
+    # Warm up every worker and its database connection
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(lambda url: fetch(url, token), urls[: concurrency * 2]))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(lambda url: fetch(url, token), urls))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(milliseconds for _, milliseconds in results)
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "req/s": requests_count / elapsed,
+        "p50": percentiles[49],
+        "p95": percentiles[94],
+        "p99": percentiles[98],
+        "errors": sum(1 for status, _ in results if status != 200),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=2, help="Server processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="Parallel clients")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--username", default="john_dev")
+    args = parser.parse_args()
+
+    token = str(AccessToken.for_user(User.objects.get(username=args.username)))
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(
+        f"{args.requests} requests, {args.concurrency} clients, "
+        f"{args.workers} worker(s)\n"
+    )
+    print(
+        f"{'server':<30} {'req/s':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'errors':>7}"
+    )
+    for name, (command, environment) in server_commands(args.workers, args.port).items():
+        server = subprocess.Popen(
+            command, cwd=BASE_DIR, env={**os.environ, **environment}
+        )
+        try:
+            wait_until_ready(base_url, server)
+            result = load(base_url, token, args.concurrency, args.requests)
+        finally:
+            server.terminate()
+            server.wait()
+
+        print(
+            f"{name:<30} {result['req/s']:>8.1f} {result['p50']:>8.2f}ms "
+            f"{result['p95']:>8.2f}ms {result['p99']:>8.2f}ms {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,29 @@
 #!/bin/bash
-python manage.py migrate
-python load_test_data.py
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+# Usage: ./entrypoint.sh [web|migrate|load-data|dev]
+#   web        Production server (gunicorn, see gunicorn.conf.py), the default
+#   migrate    One-shot job: apply the migrations
+#   load-data  One-shot job: load the test data (idempotent)
+#   dev        Migrate, load the test data and run the development server
+set -e
+
+case "${1:-web}" in
+    web)
+        # exec: gunicorn receives the signals (HUP: graceful reload, TERM: graceful stop)
+        exec gunicorn --config gunicorn.conf.py
+        ;;
+    migrate)
+        exec python manage.py migrate --noinput
+        ;;
+    load-data)
+        exec python load_test_data.py
+        ;;
+    dev)
+        python manage.py migrate
+        python load_test_data.py
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+    *)
+        echo "Unknown command: $1 (expected web, migrate, load-data or dev)" >&2
+        exit 1
+        ;;
+esac
@@ -0,0 +1,90 @@
+"""
+Gunicorn configuration of the production server (`./entrypoint.sh web`).
+
+The defaults are derived from the CPUs available to the container and can be
+overridden with environment variables:
+
+    GUNICORN_BIND            Address to listen on (0.0.0.0:8000)
+    WEB_CONCURRENCY          Worker processes
+    GUNICORN_WORKER_CLASS    gthread (WSGI, sync views), or
+                             uvicorn_worker.UvicornWorker (ASGI, async views)
+    GUNICORN_THREADS         Threads per worker, for gthread (2)
+    GUNICORN_TIMEOUT         Seconds before a silent worker is killed and replaced
+    GUNICORN_GRACEFUL_TIMEOUT  Seconds given to the workers to finish their requests
+                             on reload (HUP) and shutdown (TERM)
+    GUNICORN_LOG_LEVEL       Level of the error log (info)
+"""
+
+import os
+import sys
+
+from envparse import env
+
+
+def available_cpus():
+    """CPUs this process may run on (those of the container, not of the host)"""
+    try:
+        return len(os.sched_getaffinity(0))
+
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = env("GUNICORN_BIND", default="0.0.0.0:8000")
+
+# Sync views on WSGI workers: they served about twice the requests per second of the
+# async views on uvicorn in benchmarks/server_throughput.py. The threaded worker,
+# unlike the sync one, keeps notifying the master while a long export is streamed,
+# which the timeout would otherwise kill
+worker_class = env("GUNICORN_WORKER_CLASS", default="gthread")
+asgi = "uvicorn" in worker_class.lower()
+wsgi_app = (
+    "project_manager.asgi:application" if asgi else "project_manager.wsgi:application"
+)
+
+# An async worker overlaps the requests waiting on the database by itself, one per
+# CPU is enough; a WSGI worker serves one request per thread at a time
+workers = env(
+    "WEB_CONCURRENCY",
+    cast=int,
+    default=available_cpus() if asgi else available_cpus() * 2 + 1,
+)
+threads = env("GUNICORN_THREADS", cast=int, default=2)
+
+timeout = env("GUNICORN_TIMEOUT", cast=int, default=30)
+graceful_timeout = env("GUNICORN_GRACEFUL_TIMEOUT", cast=int, default=30)
+keepalive = 5
+
+# Import Django and the project once in the master: the forked workers share that
+# memory copy-on-write and start faster. Code changes then need a restart, a HUP
+# only replaces the workers (with the reloaded configuration)
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = env("GUNICORN_LOG_LEVEL", default="info")
+
+
+def when_ready(server):
+    """
+    Refuse to serve with several workers on a per-process cache: the invalidations
+    of a write (dashboards, users, primary stickiness) would not reach the others
+    """
+    from django.conf import settings
+
+    backend = settings.CACHES["default"]["BACKEND"]
+    if server.num_workers > 1 and backend.endswith(".LocMemCache"):
+        server.log.error(
+            "%s workers on the per-process %s: set CACHE_BACKEND and CACHE_LOCATION "
+            "to a shared cache (e.g. Redis), or WEB_CONCURRENCY=1",
+            server.num_workers,
+            backend,
+        )
+        sys.exit(1)
+
+
+def pre_fork(server, worker):
+    """Never share a database connection opened in the master with the workers"""
+    from django.db import connections
+
+    connections.close_all()
@@ -14,6 +14,7 @@ from app_models.models.constant import TaskStatus
 from app_models.models.project import Project
 from app_models.models.task import Task
 from app_models.models.time_entry import TimeEntry
+from webapp.projects.infrastructure.repositories import DashboardRollupRepository
 
 
 def create_test_data():
@@ -331,6 +332,9 @@ def create_test_data():
                     f"✓ Created {status.lower()} time entry: {task.title} ({user.username})"
                 )
 
+    # Test data is created without the repositories, rebuild the dashboard rollups
+    DashboardRollupRepository().rebuild()
+
     print("\n✅ Test data loaded successfully!")
     print(f"Users: {User.objects.count()}")
     print(f"Projects: {Project.objects.count()}")
@@ -1,5 +1,6 @@
 import functools
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from rest_framework import status
 from rest_framework.response import Response
 
@@ -7,18 +8,42 @@ from utils.user_utils import get_connected_user
 
 
 def check_user_is_connected(api_func):
-    """Decorator to check if the user who is making the request is connected."""
+    """
+    Decorator to check if the user who is making the request is connected.
+
+    The resolved user is attached to the request as `request.connected_user`.
+    Coroutine handlers (async views) are supported.
+    """
+
+    if iscoroutinefunction(api_func):
+
+        @functools.wraps(api_func)
+        async def async_wrapper(*args, **kwargs):
+            request = args[1]
+            connected_user = await sync_to_async(get_connected_user)(request)
+            if not connected_user:
+                return _not_connected_response()
+
+            request.connected_user = connected_user
+            return await api_func(*args, **kwargs)
+
+        return async_wrapper
 
     @functools.wraps(api_func)
     def wrapper(*args, **kwargs):
         request = args[1]
         connected_user = get_connected_user(request)
         if not connected_user:
-            return Response(
-                data={"error": "You are not connected !"},
-                status=status.HTTP_401_UNAUTHORIZED,
-            )
+            return _not_connected_response()
 
+        request.connected_user = connected_user
         return api_func(*args, **kwargs)
 
     return wrapper
+
+
+def _not_connected_response():
+    return Response(
+        data={"error": "You are not connected !"},
+        status=status.HTTP_401_UNAUTHORIZED,
+    )
@@ -0,0 +1,22 @@
+from rest_framework.authentication import BaseAuthentication
+
+from utils.user_utils import get_connected_user
+
+
+class ConnectedUserAuthentication(BaseAuthentication):
+    """
+    DRF authentication backed by `get_connected_user`.
+
+    It replaces the default simplejwt authentication so the bearer token is decoded
+    and the user loaded once per request, the result being shared with the views.
+    """
+
+    def authenticate(self, request):
+        connected_user = get_connected_user(request)
+        if not connected_user:
+            return None
+
+        return connected_user, None
+
+    def authenticate_header(self, request):
+        return "Bearer"
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_manager.settings')
+# Serve the hot read endpoints with their async views
+os.environ.setdefault('ASYNC_VIEWS', 'true')
 
 application = get_asgi_application()
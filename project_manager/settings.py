@@ -11,9 +11,11 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+from copy import deepcopy
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from envparse import env
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -84,6 +86,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "project_manager.wsgi.application"
+ASGI_APPLICATION = "project_manager.asgi.application"
+
+# Route the hot read endpoints (lists, dashboard) to their async views, which only
+# pay off under an ASGI server: project_manager/asgi.py turns it on by default
+ASYNC_VIEWS = env("ASYNC_VIEWS", cast=bool, default=False)
 
 
 # Database
@@ -97,9 +104,73 @@ DATABASES = {
         "NAME": env("DATABASE_NAME"),
         "USER": env("DATABASE_USER"),
         "PASSWORD": env("DATABASE_USER_PASSWORD"),
+        # Seconds a connection is kept open to serve the next requests of its thread
+        # (0: a connection per request, None: unlimited), checked before being reused
+        "CONN_MAX_AGE": env("DATABASE_CONN_MAX_AGE", cast=int, default=0),
+        "CONN_HEALTH_CHECKS": env("DATABASE_CONN_HEALTH_CHECKS", cast=bool, default=True),
+        "OPTIONS": {},
     }
 }
 
+# PostgreSQL only: share a pool of connections between the threads of a process
+# (psycopg_pool), instead of a connection per thread. It replaces the persistent
+# connections (DATABASE_CONN_MAX_AGE must stay 0) and suits the ASGI workers, whose
+# requests run on short-lived threads
+if env("DATABASE_POOL", cast=bool, default=False):
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": env("DATABASE_POOL_MIN_SIZE", cast=int, default=2),
+        "max_size": env("DATABASE_POOL_MAX_SIZE", cast=int, default=10),
+        # Seconds a request waits for a free connection before failing
+        "timeout": env("DATABASE_POOL_TIMEOUT", cast=int, default=10),
+    }
+
+# Read replica of the default database, serving the read-only use cases (lists,
+# dashboard), enabled by its host or name: the other settings are the primary's
+if env("DATABASE_REPLICA_HOST", default="") or env("DATABASE_REPLICA_NAME", default=""):
+    DATABASES["replica"] = {
+        **deepcopy(DATABASES["default"]),
+        "HOST": env("DATABASE_REPLICA_HOST", default=DATABASES["default"]["HOST"]),
+        "PORT": env(
+            "DATABASE_REPLICA_PORT", cast=int, default=DATABASES["default"]["PORT"]
+        ),
+        "NAME": env("DATABASE_REPLICA_NAME", default=DATABASES["default"]["NAME"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["webapp.shared.infrastructure.database_routing.PrimaryReplicaRouter"]
+
+# Seconds the data of an owner is read from the primary after its writes, longer than
+# the replication lag
+DATABASE_REPLICA_STICKY_SECONDS = env(
+    "DATABASE_REPLICA_STICKY_SECONDS", cast=int, default=5
+)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The default in-memory cache is per process: with several workers, use a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) so that the
+# invalidations of a write reach every worker
+
+CACHES = {
+    "default": {
+        "BACKEND": env(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": env("CACHE_LOCATION", default=""),
+    }
+}
+
+# The primary stickiness after a write (see database_routing) lives in the cache: every
+# server process must see it, or a writer reads its stale data from the replica
+if "replica" in DATABASES and CACHES["default"]["BACKEND"].endswith(
+    (".LocMemCache", ".DummyCache")
+):
+    raise ImproperlyConfigured(
+        "A read replica needs a cache shared by the server processes: set "
+        "CACHE_BACKEND and CACHE_LOCATION (e.g. RedisCache, FileBasedCache)"
+    )
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -145,7 +216,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "middlewares.authentication.ConnectedUserAuthentication",
     )
 }
 
@@ -158,3 +229,33 @@ SWAGGER_SETTINGS = {
 
 # Simple JWT settings
 SIMPLE_JWT = {"ACCESS_TOKEN_LIFETIME": timedelta(hours=1)}
+
+# User cache of the UserRepository, in the default cache (TTL in seconds)
+USER_CACHE_TTL = env("USER_CACHE_TTL", cast=int, default=300)
+
+# Read the dashboard from the incrementally maintained rollups instead of the tasks
+DASHBOARD_USE_ROLLUPS = env("DASHBOARD_USE_ROLLUPS", cast=bool, default=True)
+
+# Bulk task creation: maximum tasks per request, tasks per INSERT statement
+TASK_BULK_CREATE_MAX_SIZE = env("TASK_BULK_CREATE_MAX_SIZE", cast=int, default=5000)
+TASK_BULK_CREATE_BATCH_SIZE = env("TASK_BULK_CREATE_BATCH_SIZE", cast=int, default=500)
+
+# Maximum rows of a time report response, longer reports have to be streamed
+TIME_REPORT_MAX_ROWS = env("TIME_REPORT_MAX_ROWS", cast=int, default=1000)
+
+# Rows fetched per round trip by the streamed exports
+EXPORT_CHUNK_SIZE = env("EXPORT_CHUNK_SIZE", cast=int, default=2000)
+
+# Part of the ETag of the conditional responses: bump it when the representation of
+# the responses changes, or set it to the release id on every deploy
+ETAG_VERSION = env("ETAG_VERSION", default="1")
+
+# Dashboard cache: seconds a payload is served without recomputing it, extra seconds a
+# stale payload is still served while a single request recomputes it
+DASHBOARD_CACHE_TTL = env("DASHBOARD_CACHE_TTL", cast=int, default=60)
+DASHBOARD_CACHE_STALE_TTL = env("DASHBOARD_CACHE_STALE_TTL", cast=int, default=300)
+
+# Read the independent queries of a request (e.g. a list page and its total) at once,
+# from a pool of threads: each thread holds its own database connection
+PARALLEL_READ_QUERIES = env("PARALLEL_READ_QUERIES", cast=bool, default=False)
+PARALLEL_READ_WORKERS = env("PARALLEL_READ_WORKERS", cast=int, default=4)
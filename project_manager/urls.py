@@ -16,6 +16,7 @@ Including another URLconf
 """
 
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
 from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
@@ -42,3 +43,6 @@ urlpatterns = [
     path("api/projects/", include("webapp.projects.presentation.urls")),
     path("api/tasks/", include("webapp.tasks.presentation.urls"))
 ]
+
+# Serve the static files (e.g. of the API docs) in DEBUG, with any server
+urlpatterns += staticfiles_urlpatterns()
@@ -1,3 +1,4 @@
+from .lean_serializer import ProjectListSerializer, TaskListSerializer
 from .project_serializer import ProjectSerializer, ProjectsWithTaskStatistics
 from .task_serializer import TaskSerializer, TaskTimeEntrySerializer
 from .user_serializer import UserSerializer
@@ -0,0 +1,105 @@
+from django.utils import timezone
+
+from webapp.shared import exceptions
+
+
+def format_datetime(value, tz):
+    """Render a datetime like the DRF DateTimeField does (ISO 8601, "Z" for UTC)"""
+    if value is None:
+        return None
+
+    value = value.astimezone(tz).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+
+    return value
+
+
+class LeanListSerializer:
+    """
+    Serializer of list rows read with `.values()`, without the field binding and
+    the per-field method calls of a ModelSerializer with `many=True`.
+
+    `fields` is the explicit and ordered plan of the serialized rows: tuples of
+    (output name, `.values()` source, representation function or None). The
+    representation functions get the value and the current time zone, resolved
+    once per serialization.
+    """
+
+    fields = ()
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def values(cls):
+        """Names of the values to read from the database for this serializer"""
+        return [source for _, source, _ in cls.fields]
+
+    @classmethod
+    def select(cls, names=None):
+        """
+        Restrict the serializer to some output fields (a sparse fieldset), kept in
+        the order of the plan. Without names, every field is serialized.
+        """
+        if not names:
+            return cls
+
+        available = [name for name, _, _ in cls.fields]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise exceptions.ValidationException(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Available fields: {', '.join(available)}"
+            )
+
+        return type(
+            cls.__name__,
+            (cls,),
+            {"fields": tuple(field for field in cls.fields if field[0] in names)},
+        )
+
+    @property
+    def data(self):
+        tz = timezone.get_current_timezone()
+        plan = self.fields
+        return [
+            {
+                name: represent(row[source], tz) if represent else row[source]
+                for name, source, represent in plan
+            }
+            for row in self.rows
+        ]
+
+
+class ProjectListSerializer(LeanListSerializer):
+    """Projects with their task statistics, same output as ProjectsWithTaskStatistics"""
+
+    fields = (
+        ("id", "id", None),
+        ("owner", "owner__username", None),
+        ("total_tasks", "total_tasks", None),
+        ("completed_tasks", "completed_tasks", None),
+        ("total_estimated_time", "total_estimated_time", None),
+        ("total_spent_time", "total_spent_time", None),
+        ("created_at", "created_at", format_datetime),
+        ("updated_at", "updated_at", format_datetime),
+        ("title", "title", None),
+        ("description", "description", None),
+    )
+
+
+class TaskListSerializer(LeanListSerializer):
+    """Tasks, same output as TaskSerializer"""
+
+    fields = (
+        ("id", "id", None),
+        ("created_at", "created_at", format_datetime),
+        ("updated_at", "updated_at", format_datetime),
+        ("title", "title", None),
+        ("description", "description", None),
+        ("status", "status", None),
+        ("estimated_time", "estimated_time", None),
+        ("spent_time", "spent_time", None),
+        ("project", "project_id", None),
+    )
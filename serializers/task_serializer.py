@@ -8,11 +8,12 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = "__all__"
+        # The owner is denormalized from the project, not part of the API
+        exclude = ["owner"]
 
 
 class TaskTimeEntrySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = TimeEntry
-        fields = "__all__"
+        exclude = ["owner"]
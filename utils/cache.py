@@ -0,0 +1,59 @@
+import threading
+
+from django.core.cache import caches
+
+
+class SharedTTLCache:
+    """
+    Cache stored in a Django cache backend, shared by every worker process when the
+    backend is (e.g. Redis): an entry deleted by one worker is gone for all of them.
+    Entries expire after `ttl` seconds, the backend bounds the size.
+
+    Keys are tuples, namespaced by `prefix`. The hit/miss counters are per process.
+    """
+
+    def __init__(self, prefix: str, ttl: float = 300, alias: str = "default"):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def _key(self, key):
+        return ":".join([self.prefix, *[str(part) for part in key]])
+
+    def get(self, key, default=None):
+        """Get a cached value, or `default` if it is missing or expired"""
+        value = self._cache.get(self._key(key))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return default if value is None else value
+
+    def set_many(self, entries):
+        """Cache several values at once, a dict of key -> value"""
+        self._cache.set_many(
+            {self._key(key): value for key, value in entries.items()}, timeout=self.ttl
+        )
+
+    def delete(self, *keys):
+        """Remove the given keys from the cache"""
+        self._cache.delete_many([self._key(key) for key in keys])
+
+    def stats(self):
+        """Get the hit/miss counters of this process, for monitoring"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl": self.ttl,
+                "backend": type(self._cache).__name__,
+            }
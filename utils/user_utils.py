@@ -1,19 +1,37 @@
 import re
 
-from django.contrib.auth import get_user_model
 from django.http.request import HttpRequest
 from rest_framework_simplejwt.tokens import AccessToken
 
-User = get_user_model()
+from webapp.users.infrastructure.repositories import UserRepository
+
+# Attribute of the underlying Django request where the resolved user is cached
+CONNECTED_USER_ATTR = "_connected_user"
 
 
 def get_connected_user(request: HttpRequest):
     """
     Get the current user from the request.
 
+    The bearer token is decoded only once per request: the resolved user (or None)
+    is cached on the underlying Django request, so the DRF authentication class,
+    the `check_user_is_connected` decorator and the views all share the same result.
+
     :param request: HTTP request information of a endpoint
     :return: The user object if the user is authenticated, otherwise None.
     """
+    # DRF wraps the Django request, cache on the wrapped one so both share it
+    django_request = getattr(request, "_request", request)
+    if hasattr(django_request, CONNECTED_USER_ATTR):
+        return getattr(django_request, CONNECTED_USER_ATTR)
+
+    connected_user = _resolve_user_from_token(request)
+    setattr(django_request, CONNECTED_USER_ATTR, connected_user)
+    return connected_user
+
+
+def _resolve_user_from_token(request: HttpRequest):
+    """Decode the bearer token of the request and load the matching active user"""
     header_token = request.META.get("HTTP_AUTHORIZATION", None)
     if not header_token or header_token == "Bearer":
         return None
@@ -25,7 +43,12 @@ def get_connected_user(request: HttpRequest):
     try:
         access_token = AccessToken(token)
         user_id = access_token["user_id"]
-        return User.objects.get(id=user_id)
+        user = UserRepository().get_by_id(user_id)
 
     except:
         return None
+
+    if not user or not user.is_active:
+        return None
+
+    return user
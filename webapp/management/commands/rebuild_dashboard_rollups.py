@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from webapp.projects.infrastructure.repositories import DashboardRollupRepository
+
+
+class Command(BaseCommand):
+    help = "Rebuild the dashboard rollups from the tasks, or only report their drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report the projects whose rollup drifted, without fixing them",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of projects aggregated per query",
+        )
+
+    def handle(self, *args, **options):
+        drifted_project_ids = DashboardRollupRepository().rebuild(
+            fix=not options["verify"], batch_size=options["batch_size"]
+        )
+
+        for project_id in drifted_project_ids:
+            self.stdout.write(f"Drifted rollup: project {project_id}")
+
+        if options["verify"]:
+            self.stdout.write(f"{len(drifted_project_ids)} drifted rollup(s) found")
+            if drifted_project_ids:
+                raise SystemExit(1)
+
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"{len(drifted_project_ids)} rollup(s) rebuilt")
+            )
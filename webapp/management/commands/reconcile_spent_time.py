@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from webapp.tasks.infrastructure.repositories import TimeEntryRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the time entry durations and the task spent times from the time "
+        "entries, or only report their drift"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report the drifted time entries and tasks, without fixing them",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows read per query",
+        )
+
+    def handle(self, *args, **options):
+        drifted_entry_ids, drifted_task_ids = TimeEntryRepository().reconcile_spent_time(
+            fix=not options["verify"], batch_size=options["batch_size"]
+        )
+
+        for entry_id in drifted_entry_ids:
+            self.stdout.write(f"Drifted duration: time entry {entry_id}")
+
+        for task_id in drifted_task_ids:
+            self.stdout.write(f"Drifted spent time: task {task_id}")
+
+        summary = (
+            f"{len(drifted_entry_ids)} time entry duration(s) and "
+            f"{len(drifted_task_ids)} task spent time(s)"
+        )
+        if options["verify"]:
+            self.stdout.write(f"{summary} drifted")
+            if drifted_entry_ids or drifted_task_ids:
+                raise SystemExit(1)
+
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{summary} fixed"))
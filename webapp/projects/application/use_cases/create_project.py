@@ -3,7 +3,6 @@ from typing import Optional, Union
 from webapp.shared.infrastructure.repositories import (
     BaseRepository,
     ProjectRepositoryInterface,
-    UserRepositoryInterface,
 )
 
 
@@ -13,23 +12,20 @@ class CreateProjectUseCase:
     def __init__(
         self,
         project_repository: Union[BaseRepository, ProjectRepositoryInterface],
-        user_repository: Union[BaseRepository, UserRepositoryInterface],
     ):
         self.project_repository = project_repository
-        self.user_repository = user_repository
 
-    def execute(self, owner_id: str, title: str, description: Optional[str] = None):
-        """Execute project creation"""
+    def execute(self, owner, title: str, description: Optional[str] = None):
+        """Execute project creation for the already authenticated owner"""
 
-        existing_user = self.user_repository.get_by_id(owner_id)
-        if not existing_user:
+        if not owner:
             raise Exception("User not found")
 
         # Create project
         project_data = {
             "title": title.strip(),
             "description": description or "",
-            "owner": existing_user,
+            "owner": owner,
         }
 
         project = self.project_repository.create(project_data)
@@ -1,52 +1,45 @@
-from webapp.shared.infrastructure.repositories import (
-    BaseRepository,
-    ProjectRepositoryInterface,
-    TaskRepositoryInterface,
-)
+from webapp.shared.infrastructure.database_routing import areplica_reads, replica_reads
+from webapp.shared.infrastructure.repositories import DashboardRepositoryInterface
 
 
 class DashboardOverviewUseCase:
     """Use case for analytics and dashboard overview"""
 
-    def __init__(
-        self,
-        project_repository: ProjectRepositoryInterface,
-        task_repository: TaskRepositoryInterface,
-        user_repository: BaseRepository,
-    ):
-        self.project_repository = project_repository
-        self.task_repository = task_repository
-        self.user_repository = user_repository
+    def __init__(self, dashboard_repository: DashboardRepositoryInterface):
+        self.dashboard_repository = dashboard_repository
 
-    def execute(self, user_id: str):
+    def execute(self, user):
         """Execute to get comprehensive dashboard overview"""
 
-        current_user = self.user_repository.get_by_id(user_id)
-        if not current_user:
-            Exception("User not found")
+        if not user:
+            raise Exception("User not found")
 
-        tasks_status_count = self.task_repository.get_tasks_by_status_count(current_user)
-        tasks_by_status = {"todo": 0, "in_progress": 0, "done": 0}
-        for item in tasks_status_count:
-            tasks_by_status[item["status"]] += item["count"]
+        with replica_reads(user.id):
+            # Every figure comes from a single query
+            summary = self.dashboard_repository.get_dashboard_summary(user)
+            return self._build_overview(summary)
 
-        tasks_by_time_summary = self.task_repository.get_tasks_time_summary(current_user)
-        projects_time_spent = self.project_repository.get_with_time_spent(current_user)
-        total_projects = len(self.project_repository.get_by_owner(current_user))
-        total_tasks = len(self.task_repository.get_by_user(current_user))
+    async def aexecute(self, user):
+        """Async variant of `execute`, reading the figures with the async ORM"""
 
+        if not user:
+            raise Exception("User not found")
+
+        async with areplica_reads(user.id):
+            summary = await self.dashboard_repository.aget_dashboard_summary(user)
+            return self._build_overview(summary)
+
+    def _build_overview(self, summary):
+        """Build the dashboard overview response from the aggregated summary"""
         return {
-            "tasks_by_status": tasks_by_status,
+            "tasks_by_status": summary["tasks_by_status"],
             "time_summary": {
                 "total_estimated_hours": self._duration_to_hours(
-                    tasks_by_time_summary["total_estimated"]
-                ),
-                "total_spent_hours": self._duration_to_hours(
-                    tasks_by_time_summary["total_spent"]
+                    summary["total_estimated"]
                 ),
+                "total_spent_hours": self._duration_to_hours(summary["total_spent"]),
                 "estimated_vs_spent_ratio": self._calculate_time_ratio(
-                    tasks_by_time_summary["total_spent"],
-                    tasks_by_time_summary["total_estimated"],
+                    summary["total_spent"], summary["total_estimated"]
                 ),
             },
             "projects_time": [
@@ -57,10 +50,10 @@ class DashboardOverviewUseCase:
                         project["total_time_spent"]
                     ),
                 }
-                for project in projects_time_spent
+                for project in summary["projects_time"]
             ],
-            "total_projects": total_projects,
-            "total_tasks": total_tasks,
+            "total_projects": summary["total_projects"],
+            "total_tasks": summary["total_tasks"],
         }
 
     def _duration_to_hours(self, duration):
@@ -4,7 +4,6 @@ from webapp.shared import exceptions
 from webapp.shared.infrastructure.repositories import (
     BaseRepository,
     ProjectRepositoryInterface,
-    UserRepositoryInterface,
 )
 
 
@@ -14,23 +13,20 @@ class DeleteProjectUseCase:
     def __init__(
         self,
         project_repository: Union[BaseRepository, ProjectRepositoryInterface],
-        user_repository: Union[BaseRepository, UserRepositoryInterface],
     ):
         self.project_repository = project_repository
-        self.user_repository = user_repository
 
-    def execute(self, owner_id: str, project_id: str):
+    def execute(self, owner, project_id: str):
         """Execute project deleting"""
 
-        existing_user = self.user_repository.get_by_id(owner_id)
-        if not existing_user:
+        if not owner:
             raise Exception("User not found")
 
         existing_project = self.project_repository.get_by_id(project_id)
         if not existing_project:
             raise exceptions.ProjectNotFoundException("Project not found")
 
-        if existing_project.owner != existing_user:
+        if not self.project_repository.is_owned_by(existing_project, owner.id):
             raise exceptions.UnauthorizedAccessException(
                 "You are not authorized to delete this project"
             )
@@ -1,10 +1,20 @@
 from datetime import datetime
-from typing import Any, Optional, Union
+from functools import partial
+from typing import Any, Optional, Sequence, Union
 
+from webapp.shared.infrastructure.concurrent_queries import run_concurrently
+from webapp.shared.infrastructure.database_routing import areplica_reads, replica_reads
 from webapp.shared.infrastructure.repositories import (
     BaseRepository,
     ProjectRepositoryInterface,
-    UserRepositoryInterface,
+)
+from webapp.shared.pagination import (
+    acount_total,
+    apaginate_by_cursor,
+    count_total,
+    decode_cursor,
+    paginate_by_cursor,
+    with_cursor_fields,
 )
 
 
@@ -14,32 +24,183 @@ class ListProjectUseCase:
     def __init__(
         self,
         project_repository: Union[BaseRepository, ProjectRepositoryInterface],
-        user_repository: Union[BaseRepository, UserRepositoryInterface],
     ):
         self.project_repository = project_repository
-        self.user_repository = user_repository
 
     def execute(
         self,
-        owner_id: str,
+        owner,
+        page: int,
+        size: int,
+        query: Optional[str] = "",
+        status: Optional[str] = "",
+        start_date: Optional[Any] = None,
+        end_date: Optional[Any] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        approximate_total: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        """
+        Execute project listing with optional filters and pagination.
+
+        When `cursor` is given (an empty string for the first page), keyset
+        pagination on (created_at, id) is used instead of page/size: only `size + 1`
+        rows are read and the total is computed only if `with_total` is True.
+        With `approximate_total`, counting stops at a cap and bigger totals are
+        reported as e.g. "1000+".
+        With `fields`, the listed items are dicts of these values (see the lean list
+        serializers) instead of model instances.
+        """
+
+        if not owner:
+            raise Exception("User not found")
+
+        with replica_reads(owner.id):
+            filters = self._build_filters(query, status, start_date, end_date)
+            if cursor is not None:
+                if cursor:
+                    filters["cursor"] = decode_cursor(cursor)
+
+                searched_projects = self.project_repository.get_by_owner(
+                    owner, filters, fields=with_cursor_fields(fields)
+                )
+                read_page = partial(paginate_by_cursor, searched_projects, size)
+                if not with_total:
+                    projects, more, next_cursor = read_page()
+                    return {
+                        "size": size,
+                        "more": more,
+                        "next_cursor": next_cursor,
+                        "projects": projects,
+                    }
+
+                count_filters = {
+                    key: value for key, value in filters.items() if key != "cursor"
+                }
+                (projects, more, next_cursor), total = run_concurrently(
+                    read_page,
+                    partial(
+                        count_total,
+                        partial(
+                            self.project_repository.count_by_owner, owner, count_filters
+                        ),
+                        approximate_total,
+                    ),
+                )
+                return {
+                    "size": size,
+                    "more": more,
+                    "next_cursor": next_cursor,
+                    "projects": projects,
+                    "total": total,
+                }
+
+            # Searches are ordered by relevance, keyset pages keep the (created_at, id)
+            # order
+            searched_projects = self.project_repository.get_by_owner(
+                owner, filters, ranked=True, fields=fields
+            )
+
+            # Manage pagination, one extra row tells if there is a next page
+            start = (page - 1) * size
+            end = page * size
+            # The page and the total are read at once (see PARALLEL_READ_QUERIES)
+            projects, total = run_concurrently(
+                partial(list, searched_projects[start : end + 1]),
+                partial(
+                    count_total,
+                    partial(self.project_repository.count_by_owner, owner, filters),
+                    approximate_total,
+                ),
+            )
+
+            return {
+                "page": page,
+                "size": size,
+                "total": total,
+                "more": len(projects) > size,
+                "projects": projects[:size],
+            }
+
+    async def aexecute(
+        self,
+        owner,
         page: int,
         size: int,
         query: Optional[str] = "",
         status: Optional[str] = "",
         start_date: Optional[Any] = None,
         end_date: Optional[Any] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        approximate_total: bool = False,
+        fields: Optional[Sequence[str]] = None,
     ):
-        """Execute project listing with optional filters and pagination"""
+        """Async variant of `execute`, reading the projects with the async ORM"""
 
-        existing_user = self.user_repository.get_by_id(owner_id)
-        if not existing_user:
+        if not owner:
             raise Exception("User not found")
 
+        async with areplica_reads(owner.id):
+            filters = self._build_filters(query, status, start_date, end_date)
+            if cursor is not None:
+                if cursor:
+                    filters["cursor"] = decode_cursor(cursor)
+
+                searched_projects = self.project_repository.get_by_owner(
+                    owner, filters, fields=with_cursor_fields(fields)
+                )
+                projects, more, next_cursor = await apaginate_by_cursor(
+                    searched_projects, size
+                )
+                paginated_projects = {
+                    "size": size,
+                    "more": more,
+                    "next_cursor": next_cursor,
+                    "projects": projects,
+                }
+                if with_total:
+                    filters.pop("cursor", None)
+                    paginated_projects["total"] = await acount_total(
+                        partial(self.project_repository.acount_by_owner, owner, filters),
+                        approximate_total,
+                    )
+
+                return paginated_projects
+
+            searched_projects = self.project_repository.get_by_owner(
+                owner, filters, ranked=True, fields=fields
+            )
+            start = (page - 1) * size
+            end = page * size
+            projects = [project async for project in searched_projects[start : end + 1]]
+            total = await acount_total(
+                partial(self.project_repository.acount_by_owner, owner, filters),
+                approximate_total,
+            )
+
+            return {
+                "page": page,
+                "size": size,
+                "total": total,
+                "more": len(projects) > size,
+                "projects": projects[:size],
+            }
+
+    def _build_filters(
+        self,
+        query: Optional[str] = "",
+        status: Optional[str] = "",
+        start_date: Optional[Any] = None,
+        end_date: Optional[Any] = None,
+    ):
+        """Build the repository filters of the listing parameters"""
+
         parsed_start_date, parsed_end_date = self._parse_and_validate_dates(
             start_date, end_date
         )
 
-        # Building filters
         filters = {}
         if query:
             filters["search_term"] = query
@@ -53,20 +214,7 @@ class ListProjectUseCase:
         if parsed_end_date:
             filters["end_date"] = parsed_end_date
 
-        searched_projects = self.project_repository.get_by_owner(existing_user, filters)
-
-        # Manage pagination
-        start = (page - 1) * size
-        end = page * size
-        total = len(searched_projects)
-
-        return {
-            "page": page,
-            "size": size,
-            "total": total,
-            "more": end < total,
-            "projects": searched_projects[start:end] if searched_projects else [],
-        }
+        return filters
 
     @staticmethod
     def _parse_and_validate_dates(
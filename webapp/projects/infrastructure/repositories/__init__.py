@@ -1 +1,2 @@
+from .dashboard_rollup_repository import DashboardRollupRepository
 from .project_repository import ProjectRepository
@@ -0,0 +1,189 @@
+from collections import Counter
+
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from app_models.models.constant import TaskStatus
+from app_models.models.dashboard_rollup import DashboardRollup
+from app_models.models.project import Project
+from webapp.shared.infrastructure.data_versions import notify_owner_data_changed
+from webapp.shared.infrastructure.repositories import DashboardRepositoryInterface
+
+ROLLUP_FIELDS = (
+    *[f"{item.value}_tasks" for item in TaskStatus],
+    "total_estimated_time",
+    "total_spent_time",
+)
+
+
+class DashboardRollupRepository(DashboardRepositoryInterface):
+    """Repository for the per-project dashboard rollups"""
+
+    def get_dashboard_summary(self, user):
+        """Get every dashboard figure of a user from the rollups of its projects"""
+        return self._summarize(self._dashboard_query(user))
+
+    async def aget_dashboard_summary(self, user):
+        """Async variant of `get_dashboard_summary`"""
+        return self._summarize([rollup async for rollup in self._dashboard_query(user)])
+
+    @staticmethod
+    def _dashboard_query(user):
+        return (
+            DashboardRollup.objects.filter(owner=user)
+            .values("project_id", "project__title", *ROLLUP_FIELDS)
+            .order_by("-total_spent_time")
+        )
+
+    @staticmethod
+    def _summarize(rollups):
+        """Sum the dashboard figures of the rollups rows"""
+        summary = {
+            "tasks_by_status": {item.value: 0 for item in TaskStatus},
+            "total_estimated": 0,
+            "total_spent": 0,
+            "total_projects": 0,
+            "total_tasks": 0,
+            "projects_time": [],
+        }
+        for rollup in rollups:
+            for item in TaskStatus:
+                summary["tasks_by_status"][item.value] += rollup[f"{item.value}_tasks"]
+                summary["total_tasks"] += rollup[f"{item.value}_tasks"]
+
+            summary["total_estimated"] += rollup["total_estimated_time"]
+            summary["total_spent"] += rollup["total_spent_time"]
+            summary["total_projects"] += 1
+            summary["projects_time"].append(
+                {
+                    "id": rollup["project_id"],
+                    "title": rollup["project__title"],
+                    "total_time_spent": rollup["total_spent_time"],
+                }
+            )
+
+        return summary
+
+    def create_for_project(self, project):
+        """Create the empty rollup of a new project"""
+        return DashboardRollup.objects.create(project=project, owner_id=project.owner_id)
+
+    def apply_task_change(self, project_id, before=None, after=None):
+        """
+        Apply the change of a task on the rollup of its project.
+
+        `before` and `after` are the task snapshots (see `task_snapshot`) before and
+        after the change, None when the task is created or deleted.
+        """
+        deltas = Counter()
+        if before:
+            deltas.subtract(self._task_contribution(before))
+
+        if after:
+            deltas.update(self._task_contribution(after))
+
+        self._apply_deltas(project_id, deltas)
+
+    def apply_tasks_created(self, project_id, snapshots):
+        """Apply the creation of several tasks of a project on its rollup at once"""
+        deltas = Counter()
+        for snapshot in snapshots:
+            deltas.update(self._task_contribution(snapshot))
+
+        self._apply_deltas(project_id, deltas)
+
+    def apply_spent_time(self, project_id, duration):
+        """Add spent time (in minutes) to the rollup of a project"""
+        self._apply_deltas(project_id, {"total_spent_time": duration})
+
+    @staticmethod
+    def task_snapshot(task):
+        """Get the values of a task that the rollups depend on"""
+        return {
+            "status": task.status,
+            "estimated_time": task.estimated_time,
+            "spent_time": task.spent_time,
+        }
+
+    def rebuild(self, project_ids=None, fix=True, batch_size=500):
+        """
+        Recompute rollups from the tasks, by batches of projects.
+
+        :param project_ids: Projects to rebuild, every project if None
+        :param fix: Write the recomputed rollups, otherwise only report the drift
+        :param batch_size: Number of projects aggregated per query
+        :return: The ids of the projects whose rollup was missing or drifted
+        """
+        projects = Project.objects.order_by("id")
+        if project_ids is not None:
+            projects = projects.filter(id__in=project_ids)
+
+        drifted_project_ids = []
+        drifted_owner_ids = set()
+        last_id = ""
+        while True:
+            batch = list(self._aggregate(projects.filter(id__gt=last_id)[:batch_size]))
+            if not batch:
+                break
+
+            last_id = batch[-1]["id"]
+            existing_rollups = {
+                rollup["project_id"]: rollup
+                for rollup in DashboardRollup.objects.filter(
+                    project_id__in=[project["id"] for project in batch]
+                ).values("project_id", "owner_id", *ROLLUP_FIELDS)
+            }
+            for project in batch:
+                expected = {field: project[field] or 0 for field in ROLLUP_FIELDS}
+                expected["owner_id"] = project["owner_id"]
+                existing = existing_rollups.get(project["id"])
+                if existing and all(
+                    existing[field] == value for field, value in expected.items()
+                ):
+                    continue
+
+                drifted_project_ids.append(project["id"])
+                drifted_owner_ids.add(project["owner_id"])
+                if fix:
+                    DashboardRollup.objects.update_or_create(
+                        project_id=project["id"], defaults=expected
+                    )
+
+        if fix:
+            notify_owner_data_changed(*drifted_owner_ids)
+
+        return drifted_project_ids
+
+    @staticmethod
+    def _aggregate(projects):
+        """Aggregate the task statistics of projects, one row per project"""
+        return projects.values("id", "owner_id").annotate(
+            **{
+                f"{item.value}_tasks": Count("tasks", filter=Q(tasks__status=item))
+                for item in TaskStatus
+            },
+            total_estimated_time=Sum("tasks__estimated_time"),
+            total_spent_time=Sum("tasks__spent_time"),
+        )
+
+    @staticmethod
+    def _task_contribution(snapshot):
+        """Get what a task adds to the rollup of its project"""
+        return {
+            f"{TaskStatus(snapshot['status']).value}_tasks": 1,
+            "total_estimated_time": snapshot["estimated_time"] or 0,
+            "total_spent_time": snapshot["spent_time"] or 0,
+        }
+
+    def _apply_deltas(self, project_id, deltas):
+        """Increment the rollup counters of a project in a single UPDATE"""
+        values = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if not values:
+            return
+
+        updated = DashboardRollup.objects.filter(project_id=project_id).update(
+            **values, updated_at=timezone.now()
+        )
+        if not updated:
+            # Missing rollup (e.g. project created outside the repositories)
+            self.rebuild(project_ids=[project_id])
@@ -1,15 +1,35 @@
-from django.db.models import Count, Prefetch, Q, Sum
+from django.db import transaction
+from django.db.models import (
+    Count,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce
 
 from app_models.models.constant import TaskStatus
+from app_models.models.dashboard_rollup import DashboardRollup
 from app_models.models.project import Project
 from app_models.models.task import Task
+from app_models.models.time_entry import TimeEntry
+from webapp.projects.infrastructure.repositories.dashboard_rollup_repository import (
+    DashboardRollupRepository,
+)
+from webapp.shared.infrastructure.data_versions import notify_owner_data_changed
 from webapp.shared.infrastructure.repositories import (
     BaseRepository,
+    DashboardRepositoryInterface,
     ProjectRepositoryInterface,
 )
+from webapp.shared.search import search_filter, search_rank
 
 
-class ProjectRepository(BaseRepository, ProjectRepositoryInterface):
+class ProjectRepository(
+    BaseRepository, ProjectRepositoryInterface, DashboardRepositoryInterface
+):
     """Repository for Project entity operations"""
 
     def get_by_id(self, id):
@@ -20,15 +40,95 @@ class ProjectRepository(BaseRepository, ProjectRepositoryInterface):
         except Project.DoesNotExist:
             return None
 
-    def get_by_owner(self, user, filters_dict=None):
-        """Get all projects owned by user with filters"""
+    async def aget_by_id(self, id):
+        """Async variant of `get_by_id`"""
+        try:
+            return await Project.objects.select_related("owner").aget(id=id)
+
+        except Project.DoesNotExist:
+            return None
+
+    def get_by_ids(self, ids):
+        """Get projects by IDs, as a dict by ID (missing projects are left out)"""
+        return Project.objects.in_bulk(list(ids))
+
+    def get_by_owner(self, user, filters_dict=None, ranked=False, fields=None):
+        """
+        Get all projects owned by user with filters. With `ranked` and a search
+        term, the most relevant projects come first. With `fields`, the projects are
+        read as dicts of these values instead of model instances, and only the
+        requested task statistics are computed.
+        """
+        projects = self._filter_by_owner(user, filters_dict).select_related("owner")
+        ordering = ["-created_at", "-id"]
+        search_term = (filters_dict or {}).get("search_term", "")
+        if ranked and search_term:
+            projects = projects.annotate(search_rank=search_rank(search_term))
+            ordering.insert(0, "-search_rank")
+
+        # Subqueries rather than a join on the tasks: without a GROUP BY, the page is
+        # read in the order of the (owner, created_at) index and the statistics are
+        # only computed for its rows
+        statistics = {
+            "total_tasks": Coalesce(self._task_statistic(Count("id")), 0),
+            "completed_tasks": Coalesce(
+                self._task_statistic(Count("id"), status=TaskStatus.DONE), 0
+            ),
+            "total_estimated_time": self._task_statistic(Sum("estimated_time")),
+            "total_spent_time": self._task_statistic(Sum("spent_time")),
+        }
+        if fields:
+            # Statistics not read are not computed
+            statistics = {
+                name: aggregate
+                for name, aggregate in statistics.items()
+                if name in fields
+            }
+
+        projects = projects.order_by(*ordering).annotate(**statistics)
+        if fields:
+            projects = projects.values(*fields)
+
+        return projects
+
+    @staticmethod
+    def _task_statistic(aggregate, **filters):
+        """Aggregate of the tasks of each project, as a correlated subquery"""
+        tasks = (
+            Task.objects.filter(project_id=OuterRef("id"), **filters)
+            .order_by()
+            .values("project_id")
+            .annotate(statistic=aggregate)
+            .values("statistic")
+        )
+        return Subquery(tasks, output_field=IntegerField())
+
+    def count_by_owner(self, user, filters_dict=None, limit=None):
+        """
+        Count projects owned by user with filters, with a lean COUNT(*) query
+        (no statistics annotations, no ordering). With `limit`, counting stops
+        after `limit + 1` rows so the caller can report an approximate total.
+        """
+        return self._count_query(user, filters_dict, limit).count()
+
+    async def acount_by_owner(self, user, filters_dict=None, limit=None):
+        """Async variant of `count_by_owner`"""
+        return await self._count_query(user, filters_dict, limit).acount()
+
+    def _count_query(self, user, filters_dict=None, limit=None):
+        projects = self._filter_by_owner(user, filters_dict).order_by().values("id")
+        if limit is not None:
+            projects = projects[: limit + 1]
+
+        return projects
+
+    def _filter_by_owner(self, user, filters_dict=None):
+        """Build the filtered queryset of projects owned by user"""
         q = Q(owner=user)
         distinct = False
         if filters_dict:
             if filters_dict.get("search_term", ""):
-                q &= Q(title__icontains=filters_dict["search_term"]) | Q(
-                    description__icontains=filters_dict["search_term"]
-                )
+                q &= search_filter(filters_dict["search_term"])
 
             if filters_dict.get("status", ""):
                 distinct = True
@@ -40,16 +140,18 @@ class ProjectRepository(BaseRepository, ProjectRepositoryInterface):
             if filters_dict.get("end_date", ""):
                 q &= Q(created_at__lte=filters_dict["end_date"])
 
-        projects = Project.objects.filter(q).select_related("owner")
+            if filters_dict.get("cursor", ""):
+                # Keyset pagination: only rows after the (created_at, id) position
+                cursor_created_at, cursor_id = filters_dict["cursor"]
+                q &= Q(created_at__lt=cursor_created_at) | Q(
+                    created_at=cursor_created_at, id__lt=cursor_id
+                )
+
+        projects = Project.objects.filter(q)
         if distinct:
             projects = projects.distinct()
 
-        return projects.order_by("-created_at").annotate(
-            total_tasks=Count("tasks"),
-            completed_tasks=Count("tasks", filter=Q(tasks__status=TaskStatus.DONE)),
-            total_estimated_time=Sum("tasks__estimated_time"),
-            total_spent_time=Sum("tasks__spent_time"),
-        )
+        return projects
 
     def get_with_tasks(self, project_id, user):
         """Get project with its tasks"""
@@ -70,11 +172,15 @@ class ProjectRepository(BaseRepository, ProjectRepositoryInterface):
         except Project.DoesNotExist:
             return None
 
+    @transaction.atomic
     def create(self, project_data):
         """Create new project"""
         project = Project.objects.create(**project_data)
+        DashboardRollupRepository().create_for_project(project)
+        notify_owner_data_changed(project.owner_id)
         return project
 
+    @transaction.atomic
     def update(self, project, data):
         """Update project data"""
         for field, value in data.items():
@@ -82,16 +188,34 @@ class ProjectRepository(BaseRepository, ProjectRepositoryInterface):
                 setattr(project, field, value)
 
         project.save()
+        notify_owner_data_changed(project.owner_id)
         return project
 
+    @transaction.atomic
     def delete(self, project):
-        """Delete project"""
+        """Delete project (its dashboard rollup is deleted in cascade)"""
         project.delete()
+        notify_owner_data_changed(project.owner_id)
         return True
 
+    @transaction.atomic
+    def transfer_ownership(self, project, new_owner):
+        """
+        Give a project to another user, along with the owner denormalized on its
+        tasks, time entries and dashboard rollup
+        """
+        notify_owner_data_changed(project.owner_id, new_owner.id)
+        project.owner = new_owner
+        project.save(update_fields=["owner", "updated_at"])
+
+        Task.objects.filter(project=project).update(owner=new_owner)
+        TimeEntry.objects.filter(task__project=project).update(owner=new_owner)
+        DashboardRollup.objects.filter(project=project).update(owner=new_owner)
+        return project
+
     def is_owned_by(self, project, user_id):
         """Check if the user is owner of a project"""
-        if project.owner.id == user_id:
+        if project.owner_id == user_id:
             return True
 
         return False
@@ -104,3 +228,63 @@ class ProjectRepository(BaseRepository, ProjectRepositoryInterface):
             .values("id", "title", "total_time_spent")
             .order_by("-total_time_spent")
         )
+
+    def get_dashboard_summary(self, user):
+        """
+        Get every dashboard figure of a user in a single query: one row per owned
+        project with conditional aggregates over its tasks, totals being summed
+        from those rows. Unlike `DashboardRollupRepository`, it always reads the
+        live tasks.
+        """
+        return self._summarize(self._dashboard_query(user))
+
+    async def aget_dashboard_summary(self, user):
+        """Async variant of `get_dashboard_summary`"""
+        return self._summarize([project async for project in self._dashboard_query(user)])
+
+    @staticmethod
+    def _dashboard_query(user):
+        """One row per project of the user with the aggregates of its tasks"""
+        return (
+            Project.objects.filter(owner=user)
+            .values("id", "title")
+            .annotate(
+                total_tasks=Count("tasks"),
+                **{
+                    f"{item.value}_tasks": Count("tasks", filter=Q(tasks__status=item))
+                    for item in TaskStatus
+                },
+                total_estimated_time=Sum("tasks__estimated_time"),
+                total_time_spent=Sum("tasks__spent_time"),
+            )
+            .order_by("-total_time_spent")
+        )
+
+    @staticmethod
+    def _summarize(projects):
+        """Sum the dashboard figures of the projects rows"""
+        summary = {
+            "tasks_by_status": {item.value: 0 for item in TaskStatus},
+            "total_estimated": 0,
+            "total_spent": 0,
+            "total_projects": 0,
+            "total_tasks": 0,
+            "projects_time": [],
+        }
+        for project in projects:
+            for item in TaskStatus:
+                summary["tasks_by_status"][item.value] += project[f"{item.value}_tasks"]
+
+            summary["total_estimated"] += project["total_estimated_time"] or 0
+            summary["total_spent"] += project["total_time_spent"] or 0
+            summary["total_projects"] += 1
+            summary["total_tasks"] += project["total_tasks"]
+            summary["projects_time"].append(
+                {
+                    "id": project["id"],
+                    "title": project["title"],
+                    "total_time_spent": project["total_time_spent"],
+                }
+            )
+
+        return summary
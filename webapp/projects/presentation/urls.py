@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.urls import path
 
 from webapp.projects.presentation.views import (
+    AsyncDashboardOverviewAPIView,
+    AsyncRetrievePaginatedProjectsAPIView,
     CreateProjectAPIView,
     DashboardOverviewAPIView,
     DeleteProjectAPIView,
@@ -8,10 +11,17 @@ from webapp.projects.presentation.views import (
     RetrievePaginatedProjectsAPIView,
 )
 
+if settings.ASYNC_VIEWS:
+    list_view = AsyncRetrievePaginatedProjectsAPIView
+    dashboard_view = AsyncDashboardOverviewAPIView
+else:
+    list_view = RetrievePaginatedProjectsAPIView
+    dashboard_view = DashboardOverviewAPIView
+
 urlpatterns = [
     path("create", CreateProjectAPIView.as_view()),
     path("<str:id>/edit", EditProjectAPIView.as_view()),
     path("<str:id>/delete", DeleteProjectAPIView.as_view()),
-    path("list/", RetrievePaginatedProjectsAPIView.as_view()),
-    path("dashboard/", DashboardOverviewAPIView.as_view()),
+    path("list/", list_view.as_view()),
+    path("dashboard/", dashboard_view.as_view()),
 ]
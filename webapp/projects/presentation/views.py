@@ -1,14 +1,14 @@
 import logging
 
+from django.conf import settings
+from django.utils.cache import patch_cache_control
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from middlewares.auth_middleware import check_user_is_connected
-from serializers import ProjectSerializer
-from serializers.project_serializer import ProjectsWithTaskStatistics
-from utils.user_utils import get_connected_user
+from serializers import ProjectListSerializer, ProjectSerializer
 from webapp.projects.application.use_cases import (
     CreateProjectUseCase,
     DashboardOverviewUseCase,
@@ -16,13 +16,21 @@ from webapp.projects.application.use_cases import (
     EditProjectUseCase,
     ListProjectUseCase,
 )
-from webapp.projects.infrastructure.repositories import ProjectRepository
+from webapp.projects.infrastructure.repositories import (
+    DashboardRollupRepository,
+    ProjectRepository,
+)
 from webapp.projects.presentation.serializers import (
     CreateProjectSerializer,
     EditProjectSerializer,
 )
-from webapp.tasks.infrastructure.repositories import TaskRepository
-from webapp.users.infrastructure.repositories import UserRepository
+from webapp.shared import exceptions
+from webapp.shared.async_api_view import AsyncAPIView
+from webapp.shared.conditional import conditional_on_owner_data
+from webapp.shared.infrastructure.dashboard_cache import (
+    aget_cached_dashboard,
+    get_cached_dashboard,
+)
 
 
 class CreateProjectAPIView(APIView):
@@ -52,13 +60,13 @@ class CreateProjectAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        connected_user = get_connected_user(request)
+        connected_user = request.connected_user
         validated_data = serialized.validated_data
-        use_case = CreateProjectUseCase(ProjectRepository(), UserRepository())
+        use_case = CreateProjectUseCase(ProjectRepository())
 
         try:
             project = use_case.execute(
-                owner_id=connected_user.id,
+                owner=connected_user,
                 title=validated_data["title"],
                 description=validated_data.get("description"),
             )
@@ -102,13 +110,13 @@ class EditProjectAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        connected_user = get_connected_user(request)
+        connected_user = request.connected_user
         validated_data = serialized.validated_data
-        use_case = EditProjectUseCase(ProjectRepository(), UserRepository())
+        use_case = EditProjectUseCase(ProjectRepository())
 
         try:
             updated_project = use_case.execute(
-                owner_id=connected_user.id,
+                owner=connected_user,
                 project_id=id,
                 title=validated_data.get("title"),
                 description=validated_data.get("description"),
@@ -142,11 +150,11 @@ class DeleteProjectAPIView(APIView):
     )
     @check_user_is_connected
     def delete(self, request, id: str, *args, **kwargs):
-        connected_user = get_connected_user(request)
-        use_case = DeleteProjectUseCase(ProjectRepository(), UserRepository())
+        connected_user = request.connected_user
+        use_case = DeleteProjectUseCase(ProjectRepository())
 
         try:
-            _ = use_case.execute(owner_id=connected_user.id, project_id=id)
+            _ = use_case.execute(owner=connected_user, project_id=id)
 
             return Response(
                 {"message": "Project deleted successfully !"}, status=status.HTTP_200_OK
@@ -172,16 +180,27 @@ class RetrievePaginatedProjectsAPIView(APIView):
         ## URL PARAMETERS
         ***page***: The current page of the pagination (default = 1)
         ***size***: The size of returned items (default = 5)
-        ***query***: The user input for search
+        ***query***: The user input for search, results are ordered by relevance (except
+        in cursor pagination)
         ***status***: The task status value to filtering
         ***start_date*** and ***end_date***: The date range to filtering
+        ***cursor***: Switch to cursor pagination, empty for the first page, then the
+        returned **next_cursor** (replaces **page**, **total** is not computed)
+        ***with_total***: Set to true to compute **total** in cursor pagination
+        ***approximate_total***: Set to true to cap the count, **total** is then
+        reported as e.g. "1000+" for very large results
+        ***fields***: Comma separated fields of the returned projects (default = all),
+        e.g. "id,title". Fields not requested are neither read nor computed
         
         ## Example
         GET {BASE_URL}/api/projects/list/?page=1&size=5&query=text&status=done&start_date=2025-09-01
+        GET {BASE_URL}/api/projects/list/?cursor=&size=5
         """,
         operation_summary="Retrieve paginated projects",
         responses={
             200: ProjectSerializer(),
+            304: "Unchanged since the ETag (If-None-Match) or date (If-Modified-Since)",
+            400: '{"error": "Unknown fields: ..."}',
             404: '{"error": "You are not connected !"}',
             500: '{"error": "Projects listing failed"}',
         },
@@ -189,13 +208,47 @@ class RetrievePaginatedProjectsAPIView(APIView):
         security=[{"Bearer": []}],
     )
     @check_user_is_connected
+    @conditional_on_owner_data
     def get(self, request, *args, **kwargs):
+        params = self._listing_params(request)
+        connected_user = request.connected_user
+        use_case = ListProjectUseCase(ProjectRepository())
+
+        try:
+            list_serializer = ProjectListSerializer.select(params.pop("fields"))
+            paginated_projects = use_case.execute(
+                owner=connected_user, **params, fields=list_serializer.values()
+            )
+
+            paginated_projects.update(
+                {"projects": list_serializer(paginated_projects["projects"]).data}
+            )
+
+            return Response(paginated_projects, status=status.HTTP_200_OK)
+
+        except exceptions.ValidationException as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logging.exception(f"Error during projects listing: {e}")
+            return Response(
+                {"error": "Projects listing failed"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    @staticmethod
+    def _listing_params(request):
+        """Read the listing parameters of the URL"""
         page = 1
         size = 5
         query = ""
         filter_status = None
         start_date = None
         end_date = None
+        cursor = None
+        with_total = False
+        approximate_total = False
+        fields = []
         if "page" in request.GET and request.GET["page"].strip() != "":
             page = int(request.GET["page"])
 
@@ -214,30 +267,62 @@ class RetrievePaginatedProjectsAPIView(APIView):
         if "end_date" in request.GET and request.GET["end_date"].strip() != "":
             end_date = request.GET["end_date"]
 
-        connected_user = get_connected_user(request)
-        use_case = ListProjectUseCase(ProjectRepository(), UserRepository())
+        if "cursor" in request.GET:
+            cursor = request.GET["cursor"].strip()
+
+        if "with_total" in request.GET:
+            with_total = request.GET["with_total"].strip().lower() == "true"
+
+        if "approximate_total" in request.GET:
+            approximate_total = request.GET["approximate_total"].strip().lower() == "true"
+
+        if "fields" in request.GET:
+            fields = [
+                name.strip() for name in request.GET["fields"].split(",") if name.strip()
+            ]
+
+        return {
+            "page": page,
+            "size": size,
+            "query": query,
+            "status": filter_status,
+            "start_date": start_date,
+            "end_date": end_date,
+            "cursor": cursor,
+            "with_total": with_total,
+            "approximate_total": approximate_total,
+            "fields": fields,
+        }
+
+
+class AsyncRetrievePaginatedProjectsAPIView(
+    AsyncAPIView, RetrievePaginatedProjectsAPIView
+):
+    """Async variant of the projects listing, served under ASGI"""
+
+    @swagger_auto_schema(**RetrievePaginatedProjectsAPIView.get._swagger_auto_schema)
+    @check_user_is_connected
+    @conditional_on_owner_data
+    async def get(self, request, *args, **kwargs):
+        params = self._listing_params(request)
+        connected_user = request.connected_user
+        use_case = ListProjectUseCase(ProjectRepository())
 
         try:
-            paginated_projects = use_case.execute(
-                owner_id=connected_user.id,
-                page=page,
-                size=size,
-                query=query,
-                status=filter_status,
-                start_date=start_date,
-                end_date=end_date,
+            list_serializer = ProjectListSerializer.select(params.pop("fields"))
+            paginated_projects = await use_case.aexecute(
+                owner=connected_user, **params, fields=list_serializer.values()
             )
 
             paginated_projects.update(
-                {
-                    "projects": ProjectsWithTaskStatistics(
-                        paginated_projects["projects"], many=True
-                    ).data
-                }
+                {"projects": list_serializer(paginated_projects["projects"]).data}
             )
 
             return Response(paginated_projects, status=status.HTTP_200_OK)
 
+        except exceptions.ValidationException as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         except Exception as e:
             logging.exception(f"Error during projects listing: {e}")
             return Response(
@@ -252,10 +337,12 @@ class DashboardOverviewAPIView(APIView):
         operation_id="dashboard_overview",
         operation_description="""
         Endpoint for retrieving dashboard overview on projects and tasks.
+        The overview is cached per user and recomputed after changes of their data.
         """,
         operation_summary="Retrieve dashboard overview data",
         responses={
             200: "Dashboard Overview Data",
+            304: "Unchanged since the ETag (If-None-Match) or date (If-Modified-Since)",
             401: '{"error": "You are not connected !"}',
             500: '{"error": "Dashboard overview retrieving failed"}',
         },
@@ -263,15 +350,56 @@ class DashboardOverviewAPIView(APIView):
         security=[{"Bearer": []}],
     )
     @check_user_is_connected
+    @conditional_on_owner_data
     def get(self, request, *args, **kwargs):
-        connected_user = get_connected_user(request)
-        use_case = DashboardOverviewUseCase(
-            ProjectRepository(), TaskRepository(), UserRepository()
-        )
+        connected_user = request.connected_user
+        if settings.DASHBOARD_USE_ROLLUPS:
+            use_case = DashboardOverviewUseCase(DashboardRollupRepository())
+        else:
+            use_case = DashboardOverviewUseCase(ProjectRepository())
 
         try:
-            dashboard_overview = use_case.execute(user_id=connected_user.id)
-            return Response(dashboard_overview, status=status.HTTP_200_OK)
+            dashboard_overview, stale = get_cached_dashboard(
+                connected_user.id, lambda: use_case.execute(user=connected_user)
+            )
+            response = Response(dashboard_overview, status=status.HTTP_200_OK)
+            if stale:
+                # Older than the data version: no validators, not to be stored
+                patch_cache_control(response, no_store=True)
+
+            return response
+
+        except Exception as e:
+            logging.exception(f"Error during the dashboard overview retrieving: {e}")
+            return Response(
+                {"error": "Dashboard overview retrieving failed"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class AsyncDashboardOverviewAPIView(AsyncAPIView, DashboardOverviewAPIView):
+    """Async variant of the dashboard overview, served under ASGI"""
+
+    @swagger_auto_schema(**DashboardOverviewAPIView.get._swagger_auto_schema)
+    @check_user_is_connected
+    @conditional_on_owner_data
+    async def get(self, request, *args, **kwargs):
+        connected_user = request.connected_user
+        if settings.DASHBOARD_USE_ROLLUPS:
+            use_case = DashboardOverviewUseCase(DashboardRollupRepository())
+        else:
+            use_case = DashboardOverviewUseCase(ProjectRepository())
+
+        try:
+            dashboard_overview, stale = await aget_cached_dashboard(
+                connected_user.id, lambda: use_case.aexecute(user=connected_user)
+            )
+            response = Response(dashboard_overview, status=status.HTTP_200_OK)
+            if stale:
+                # Older than the data version: no validators, not to be stored
+                patch_cache_control(response, no_store=True)
+
+            return response
 
         except Exception as e:
             logging.exception(f"Error during the dashboard overview retrieving: {e}")
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app_models.models.task import Task
+from webapp.projects.infrastructure.repositories import ProjectRepository
+from webapp.shared.infrastructure import dashboard_cache
+
+
+class DashboardCacheTestCase(TestCase):
+    """Cached dashboard: invalidation by the writes, stale payloads while refreshing"""
+
+    def setUp(self):
+        # The dashboards and the users are cached, the user IDs of the tests reused
+        cache.clear()
+        self.user = User.objects.create_user(username="tester", password="password")
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        project = ProjectRepository().create({"title": "Project", "owner": self.user})
+        self.task = Task.objects.create(title="Task", project=project, estimated_time=60)
+        # Cached before the write of the test
+        self.dashboard = self._dashboard()
+
+    def _dashboard(self):
+        return self.client.get("/api/projects/dashboard/")
+
+    def _edit_task(self, **data):
+        # The dashboards are invalidated once the write is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                f"/api/tasks/{self.task.id}/edit", data, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cached(self):
+        response = self._dashboard()
+
+        self.assertEqual(response.json(), self.dashboard.json())
+        self.assertEqual(response["ETag"], self.dashboard["ETag"])
+
+    def test_write_is_reflected(self):
+        self._edit_task(status="done")
+
+        response = self._dashboard()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["tasks_by_status"]["done"], 1)
+        self.assertNotEqual(response["ETag"], self.dashboard["ETag"])
+
+    def test_stale_payload_while_refreshing(self):
+        self._edit_task(status="done")
+        # Another request holds the refresh lock
+        cache.add(dashboard_cache._refresh_key(self.user.id), True)
+
+        stale = self._dashboard()
+
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+        self.assertEqual(stale.json(), self.dashboard.json())
+        self.assertIn("no-store", stale["Cache-Control"])
+        self.assertFalse(stale.has_header("ETag"))
+        self.assertFalse(stale.has_header("Last-Modified"))
+
+        cache.delete(dashboard_cache._refresh_key(self.user.id))
+        refreshed = self._dashboard()
+
+        self.assertEqual(refreshed.json()["tasks_by_status"]["done"], 1)
+        self.assertNotIn("no-store", refreshed["Cache-Control"])
+        self.assertTrue(refreshed.has_header("ETag"))
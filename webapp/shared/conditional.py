@@ -0,0 +1,90 @@
+import functools
+import hashlib
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+from webapp.shared.infrastructure.data_versions import (
+    aget_owner_data_version,
+    get_owner_data_version,
+)
+
+
+def conditional_on_owner_data(api_func):
+    """
+    Decorator answering conditional GETs of the data of the connected user (to be
+    placed below `check_user_is_connected`).
+
+    The ETag is derived from the data version of the user and the requested URL,
+    salted by ETAG_VERSION and the creation time of the user (a user recreated in a
+    reset database starts again from version 0), and Last-Modified is the time of
+    the last change. When the client copy is
+    still fresh (If-None-Match / If-Modified-Since), a 304 is returned without
+    calling the view; otherwise both validators are added to the 200 response,
+    unless the view marked it no-store.
+    Last-Modified has a one second precision, the ETag should be preferred.
+    Coroutine handlers (async views) are supported.
+    """
+
+    if iscoroutinefunction(api_func):
+
+        @functools.wraps(api_func)
+        async def async_wrapper(*args, **kwargs):
+            request = args[1]
+            version = await aget_owner_data_version(request.connected_user.id)
+            etag, last_modified = _validators(request, *version)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = await api_func(*args, **kwargs)
+
+            return _add_validators(response, etag, last_modified)
+
+        return async_wrapper
+
+    @functools.wraps(api_func)
+    def wrapper(*args, **kwargs):
+        request = args[1]
+        version = get_owner_data_version(request.connected_user.id)
+        etag, last_modified = _validators(request, *version)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = api_func(*args, **kwargs)
+
+        return _add_validators(response, etag, last_modified)
+
+    return wrapper
+
+
+def _validators(request, version, last_modified):
+    """Get the ETag and the Last-Modified timestamp of a request of the user data"""
+    user = request.connected_user
+    material = (
+        f"{settings.ETAG_VERSION}:{user.id}:{user.date_joined.timestamp()}:"
+        f"{version}:{request.get_full_path()}"
+    )
+    etag = quote_etag(hashlib.md5(material.encode(), usedforsecurity=False).hexdigest())
+    return etag, int(last_modified.timestamp()) if last_modified else None
+
+
+def _add_validators(response, etag, last_modified):
+    # A response the view marked no-store (e.g. a stale cached payload) does not
+    # hold the data of the current version, its validators would be wrong
+    stored = "no-store" not in response.get("Cache-Control", "")
+    if stored and response.status_code in (
+        status.HTTP_200_OK,
+        status.HTTP_304_NOT_MODIFIED,
+    ):
+        response.headers["ETag"] = etag
+        if last_modified:
+            response.headers["Last-Modified"] = http_date(last_modified)
+
+    # Shared caches must not store the data of a user, clients must revalidate
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -34,6 +34,12 @@ class ActiveTimerExistsException(TimerException):
     pass
 
 
+class ConcurrentTimerStartException(TimerException):
+    """Another timer of the user was started concurrently exception"""
+
+    pass
+
+
 class NoActiveTimerException(TimerException):
     """No active timer found exception"""
 
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from threading import Lock
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+_executor = None
+_executor_lock = Lock()
+
+
+def run_concurrently(*calls):
+    """
+    Run independent read functions at once and get their results, in order.
+
+    Each function runs in a thread of a shared pool, on the database connection of
+    that thread: the request waits for the slowest query instead of their sum.
+    Everything runs sequentially when PARALLEL_READ_QUERIES is off, or inside a
+    transaction, whose uncommitted rows the other connections would not see.
+    """
+    if not settings.PARALLEL_READ_QUERIES or len(calls) < 2 or connection.in_atomic_block:
+        return [call() for call in calls]
+
+    executor = _get_executor()
+    # The functions run in the context of the caller, e.g. its database routing
+    futures = [
+        executor.submit(copy_context().run, _run_in_worker, call) for call in calls
+    ]
+    return [future.result() for future in futures]
+
+
+def _get_executor():
+    """Create the pool on first use, i.e. in the worker process after a fork"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PARALLEL_READ_WORKERS,
+                thread_name_prefix="read-queries",
+            )
+
+    return _executor
+
+
+def _run_in_worker(call):
+    """
+    Run a function like a request: the connection of the thread is closed after
+    it unless it is persistent (CONN_MAX_AGE) and still usable, so the pool never
+    leaks connections
+    """
+    close_old_connections()
+    try:
+        return call()
+
+    finally:
+        close_old_connections()
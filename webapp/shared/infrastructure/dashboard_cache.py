@@ -0,0 +1,111 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Longest expected computation of a dashboard, after which its refresh lock expires
+REFRESH_LOCK_TIMEOUT = 30
+
+
+def _payload_key(user_id):
+    return f"dashboard:{user_id}"
+
+
+def _generation_key(user_id):
+    return f"dashboard:{user_id}:generation"
+
+
+def _refresh_key(user_id):
+    return f"dashboard:{user_id}:refresh"
+
+
+def get_cached_dashboard(user_id, compute):
+    """
+    Get the dashboard payload of a user from the cache, computed by `compute()`
+    when missing.
+
+    A payload is fresh for DASHBOARD_CACHE_TTL seconds, as long as the data of the
+    user does not change (see `invalidate_dashboards`). Once stale, it is still
+    served for DASHBOARD_CACHE_STALE_TTL seconds to every request but the one
+    holding the refresh lock, which recomputes it: a burst of dashboard loads after
+    a write runs a single computation.
+
+    :return: The payload, and whether it is a stale one, older than the data
+    """
+    payload_key, generation_key = _payload_key(user_id), _generation_key(user_id)
+    cached = cache.get_many([payload_key, generation_key])
+    entry = cached.get(payload_key)
+    generation = cached.get(generation_key)
+    if _is_fresh(entry, generation):
+        return entry["payload"], False
+
+    refresh_key = _refresh_key(user_id)
+    if entry and not cache.add(refresh_key, True, timeout=REFRESH_LOCK_TIMEOUT):
+        # Another request is recomputing it
+        return entry["payload"], True
+
+    try:
+        payload = compute()
+        cache.set(payload_key, *_cache_entry(generation, payload))
+
+    finally:
+        if entry:
+            cache.delete(refresh_key)
+
+    return payload, False
+
+
+async def aget_cached_dashboard(user_id, compute):
+    """Async variant of `get_cached_dashboard`, `compute()` being a coroutine"""
+    payload_key, generation_key = _payload_key(user_id), _generation_key(user_id)
+    cached = await cache.aget_many([payload_key, generation_key])
+    entry = cached.get(payload_key)
+    generation = cached.get(generation_key)
+    if _is_fresh(entry, generation):
+        return entry["payload"], False
+
+    refresh_key = _refresh_key(user_id)
+    if entry and not await cache.aadd(refresh_key, True, timeout=REFRESH_LOCK_TIMEOUT):
+        # Another request is recomputing it
+        return entry["payload"], True
+
+    try:
+        payload = await compute()
+        await cache.aset(payload_key, *_cache_entry(generation, payload))
+
+    finally:
+        if entry:
+            await cache.adelete(refresh_key)
+
+    return payload, False
+
+
+def invalidate_dashboards(*user_ids):
+    """
+    Mark the cached dashboards of users as stale. They are kept to be served while
+    they are recomputed.
+    """
+    cache.set_many(
+        {_generation_key(user_id): uuid.uuid4().hex for user_id in user_ids},
+        timeout=None,
+    )
+
+
+def _is_fresh(entry, generation):
+    return (
+        entry is not None
+        and entry["generation"] == generation
+        and entry["fresh_until"] > time.time()
+    )
+
+
+def _cache_entry(generation, payload):
+    """Get the cached value of a payload and its timeout"""
+    entry = {
+        # Read before computing: a change during the computation is not missed
+        "generation": generation,
+        "fresh_until": time.time() + settings.DASHBOARD_CACHE_TTL,
+        "payload": payload,
+    }
+    return entry, settings.DASHBOARD_CACHE_TTL + settings.DASHBOARD_CACHE_STALE_TTL
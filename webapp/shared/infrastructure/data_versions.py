@@ -0,0 +1,61 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from app_models.models.owner_data_version import OwnerDataVersion
+from webapp.shared.infrastructure.dashboard_cache import invalidate_dashboards
+from webapp.shared.infrastructure.database_routing import stick_to_primary
+
+
+def notify_owner_data_changed(*owner_ids):
+    """
+    The single notification of the repositories writing projects, tasks or time
+    entries: bump the data version of their owners. Called in the transaction of
+    the write, so the version never moves without the data (nor the other way).
+    Their cached dashboards are invalidated once the write is committed, and their
+    data is read from the primary database until the write reaches the replica.
+    """
+    now = timezone.now()
+    owner_ids = sorted({owner_id for owner_id in owner_ids if owner_id})
+    if not owner_ids:
+        return
+
+    stick_to_primary(*owner_ids)
+    transaction.on_commit(lambda: invalidate_dashboards(*owner_ids))
+    for owner_id in owner_ids:
+        bumped = OwnerDataVersion.objects.filter(owner_id=owner_id).update(
+            version=F("version") + 1, updated_at=now
+        )
+        if bumped:
+            continue
+
+        try:
+            with transaction.atomic():
+                OwnerDataVersion.objects.create(owner_id=owner_id, version=1)
+
+        except IntegrityError:
+            # Created by a concurrent write in the meantime
+            OwnerDataVersion.objects.filter(owner_id=owner_id).update(
+                version=F("version") + 1, updated_at=now
+            )
+
+
+def get_owner_data_version(owner_id):
+    """
+    Get the data version of an owner and when it last changed, (0, None) if its
+    data never changed through the repositories
+    """
+    version = _owner_data_version(owner_id).first()
+    return version or (0, None)
+
+
+async def aget_owner_data_version(owner_id):
+    """Async variant of `get_owner_data_version`"""
+    version = await _owner_data_version(owner_id).afirst()
+    return version or (0, None)
+
+
+def _owner_data_version(owner_id):
+    return OwnerDataVersion.objects.filter(owner_id=owner_id).values_list(
+        "version", "updated_at"
+    )
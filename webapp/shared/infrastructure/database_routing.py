@@ -0,0 +1,92 @@
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Alias of the read replica in DATABASES, configured by the DATABASE_REPLICA_* variables
+REPLICA_DB_ALIAS = "replica"
+
+# Set by the read-only use cases: their queries may be served by the replica
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def _sticky_key(owner_id):
+    return f"primary-sticky:{owner_id}"
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def stick_to_primary(*owner_ids):
+    """
+    Read the data of owners from the primary database for the next
+    DATABASE_REPLICA_STICKY_SECONDS, the time for their writes to reach the replica
+    """
+    if not replica_configured() or not owner_ids:
+        return
+
+    cache.set_many(
+        {_sticky_key(owner_id): True for owner_id in owner_ids},
+        timeout=settings.DATABASE_REPLICA_STICKY_SECONDS,
+    )
+
+
+@contextmanager
+def replica_reads(owner_id):
+    """
+    Let the queries of the block be served by the replica, unless the owner of the
+    read data wrote recently (see `stick_to_primary`)
+    """
+    allowed = replica_configured() and cache.get(_sticky_key(owner_id)) is None
+    token = _replica_reads.set(allowed)
+    try:
+        yield
+
+    finally:
+        _replica_reads.reset(token)
+
+
+@asynccontextmanager
+async def areplica_reads(owner_id):
+    """Async variant of `replica_reads`"""
+    allowed = replica_configured() and await cache.aget(_sticky_key(owner_id)) is None
+    token = _replica_reads.set(allowed)
+    try:
+        yield
+
+    finally:
+        _replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route the reads of the read-only use cases (see `replica_reads`) to the replica,
+    everything else to the primary (default) database
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return None
+
+        # A transaction only sees its own writes on the primary
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema and rows from the primary
+        if db == REPLICA_DB_ALIAS:
+            return False
+
+        return None
@@ -52,18 +52,54 @@ class UserRepositoryInterface(ABC):
 class ProjectRepositoryInterface(ABC):
     """Interface for project repository"""
 
+    @abstractmethod
+    async def aget_by_id(self, *args):
+        pass
+
+    @abstractmethod
+    def get_by_ids(self, *args, **kwargs) -> dict:
+        pass
+
     @abstractmethod
     def get_by_owner(self, *args, **kwargs):
         pass
 
+    @abstractmethod
+    def count_by_owner(self, *args, **kwargs) -> int:
+        pass
+
+    @abstractmethod
+    async def acount_by_owner(self, *args, **kwargs) -> int:
+        pass
+
     @abstractmethod
     def is_owned_by(self, *args, **kwargs):
         pass
 
+    @abstractmethod
+    def transfer_ownership(self, *args, **kwargs):
+        pass
+
     @abstractmethod
     def get_with_time_spent(self, **kwargs):
         pass
 
+    @abstractmethod
+    def get_dashboard_summary(self, *args, **kwargs):
+        pass
+
+
+class DashboardRepositoryInterface(ABC):
+    """Interface for repositories providing the dashboard figures"""
+
+    @abstractmethod
+    def get_dashboard_summary(self, *args, **kwargs):
+        pass
+
+    @abstractmethod
+    async def aget_dashboard_summary(self, *args, **kwargs):
+        pass
+
 
 class TaskRepositoryInterface(ABC):
     """Interface for task repository"""
@@ -77,7 +113,19 @@ class TaskRepositoryInterface(ABC):
         pass
 
     @abstractmethod
-    def update_spent_time(self, *args, **kwargs):
+    def count_by_user(self, *args, **kwargs) -> int:
+        pass
+
+    @abstractmethod
+    async def acount_by_user(self, *args, **kwargs) -> int:
+        pass
+
+    @abstractmethod
+    def export_by_user(self, *args, **kwargs):
+        pass
+
+    @abstractmethod
+    def bulk_create(self, *args, **kwargs):
         pass
 
     @abstractmethod
@@ -104,10 +152,34 @@ class TimeEntryRepositoryInterface(ABC):
     def has_active_timer(self, **kwargs) -> bool:
         pass
 
+    @abstractmethod
+    def start_timer(self, *args, **kwargs):
+        pass
+
+    @abstractmethod
+    def stop_timer(self, *args, **kwargs):
+        pass
+
     @abstractmethod
     def stop_active_timers_for_user(self, **kwargs):
         pass
+
+    @abstractmethod
+    def reconcile_spent_time(self, *args, **kwargs):
+        pass
     
     @abstractmethod
     def get_by_user(self, **kwargs):
         pass
+
+    @abstractmethod
+    def get_weekly_summary(self, *args, **kwargs):
+        pass
+
+    @abstractmethod
+    def get_time_report(self, *args, **kwargs):
+        pass
+
+    @abstractmethod
+    def export_by_user(self, *args, **kwargs):
+        pass
@@ -0,0 +1,90 @@
+import base64
+import json
+from datetime import datetime
+
+from webapp.shared import exceptions
+
+# Above this number of rows, approximate totals are reported as "<limit>+"
+APPROXIMATE_COUNT_LIMIT = 1000
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """Encode the (created_at, id) position of a row into an opaque cursor"""
+    payload = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Decode an opaque cursor into the (created_at, id) position it points to"""
+    try:
+        padded_cursor = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded_cursor))
+        return datetime.fromisoformat(created_at), str(id)
+
+    except (ValueError, TypeError):
+        raise exceptions.ValidationException("Invalid pagination cursor")
+
+
+def paginate_by_cursor(items, size: int):
+    """
+    Build a keyset page from the `size + 1` items read after a cursor.
+
+    The extra item only tells whether another page exists, it is never returned.
+    Items are model instances or `.values()` dicts including "created_at" and "id".
+    """
+    return _cursor_page(list(items[: size + 1]), size)
+
+
+async def apaginate_by_cursor(items, size: int):
+    """Async variant of `paginate_by_cursor`, reading a queryset asynchronously"""
+    return _cursor_page([item async for item in items[: size + 1]], size)
+
+
+def _cursor_page(items, size: int):
+    more = len(items) > size
+    items = items[:size]
+    next_cursor = None
+    if more and items:
+        last = items[-1]
+        if isinstance(last, dict):
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+
+        else:
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+    return items, more, next_cursor
+
+
+def with_cursor_fields(fields):
+    """Add the values read by `paginate_by_cursor` to the requested `.values()`"""
+    if not fields:
+        return fields
+
+    return list(dict.fromkeys([*fields, "created_at", "id"]))
+
+
+def count_total(count, approximate: bool = False):
+    """
+    Get the total number of rows with the `count(limit=None)` function of a
+    repository. In approximate mode counting stops after APPROXIMATE_COUNT_LIMIT
+    rows and larger totals are reported as e.g. "1000+".
+    """
+    if not approximate:
+        return count()
+
+    return _approximate(count(limit=APPROXIMATE_COUNT_LIMIT))
+
+
+async def acount_total(acount, approximate: bool = False):
+    """Async variant of `count_total`, with the `acount(limit=None)` of a repository"""
+    if not approximate:
+        return await acount()
+
+    return _approximate(await acount(limit=APPROXIMATE_COUNT_LIMIT))
+
+
+def _approximate(total):
+    if total > APPROXIMATE_COUNT_LIMIT:
+        return f"{APPROXIMATE_COUNT_LIMIT}+"
+
+    return total
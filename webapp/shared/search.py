@@ -0,0 +1,52 @@
+import operator
+from functools import reduce
+
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+
+# Weight of a match per searched field, a match in the title ranks first
+SEARCH_WEIGHTS = {"title": 2.0, "description": 1.0}
+
+
+def search_filter(search_term: str, weights=None) -> Q:
+    """
+    Match the rows containing the search term in one of the searched fields.
+
+    On PostgreSQL the resulting UPPER(field) LIKE '%TERM%' conditions are served by
+    the trigram GIN indexes of those fields, instead of a sequential scan.
+    """
+    weights = weights or SEARCH_WEIGHTS
+    return reduce(
+        operator.or_, [Q(**{f"{field}__icontains": search_term}) for field in weights]
+    )
+
+
+def search_rank(search_term: str, weights=None):
+    """
+    Build the relevance expression of the rows matching a search term, the higher
+    the better.
+
+    On PostgreSQL it is the weighted trigram word similarity of the searched fields.
+    Other databases (e.g. SQLite in development) fall back to the weighted sum of
+    the fields containing the search term.
+    """
+    weights = weights or SEARCH_WEIGHTS
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        ranks = [
+            TrigramWordSimilarity(search_term, field) * Value(weight)
+            for field, weight in weights.items()
+        ]
+
+    else:
+        ranks = [
+            Case(
+                When(**{f"{field}__icontains": search_term}, then=Value(weight)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+            for field, weight in weights.items()
+        ]
+
+    return reduce(operator.add, ranks)
@@ -0,0 +1,51 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Lines produced per hop to the thread reading the database, when streamed under ASGI
+ASYNC_BATCH_LINES = 500
+
+
+class _Echo:
+    """File-like object returning what is written to it, for a streamed csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    """Encode a header and rows (tuples) as CSV, one line at a time"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    """Encode rows (dicts) as newline-delimited JSON, one line at a time"""
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def streaming_response(request, lines, content_type):
+    """
+    Stream lines of text. Under ASGI, Django would read a sync iterator entirely
+    before sending anything: the lines are then produced by batches in the thread
+    of the ORM, behind an async iterator.
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        lines = _async_batches(lines)
+
+    return StreamingHttpResponse(lines, content_type=content_type)
+
+
+async def _async_batches(lines):
+    lines = iter(lines)
+    next_batch = sync_to_async(lambda: "".join(islice(lines, ASYNC_BATCH_LINES)))
+    while batch := await next_batch():
+        yield batch
@@ -0,0 +1,96 @@
+import os
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+
+from app_models.models.task import Task
+from webapp.shared.infrastructure.database_routing import (
+    REPLICA_DB_ALIAS,
+    PrimaryReplicaRouter,
+    replica_reads,
+    stick_to_primary,
+)
+
+REPLICA_DATABASES = {
+    **settings.DATABASES,
+    REPLICA_DB_ALIAS: {**settings.DATABASES["default"], "TEST": {"MIRROR": "default"}},
+}
+
+
+@override_settings(DATABASES=REPLICA_DATABASES)
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    """Routing of the read-only use cases to the replica"""
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_go_to_the_primary_by_default(self):
+        self.assertIsNone(self.router.db_for_read(Task))
+        self.assertEqual(Task.objects.all().db, "default")
+
+    def test_replica_reads(self):
+        with replica_reads(owner_id=1):
+            self.assertEqual(self.router.db_for_read(Task), REPLICA_DB_ALIAS)
+            self.assertEqual(Task.objects.all().db, REPLICA_DB_ALIAS)
+
+        self.assertIsNone(self.router.db_for_read(Task))
+
+    def test_writes_and_migrations_stay_on_the_primary(self):
+        with replica_reads(owner_id=1):
+            self.assertEqual(self.router.db_for_write(Task), "default")
+
+        self.assertFalse(self.router.allow_migrate(REPLICA_DB_ALIAS, "app_models"))
+        self.assertIsNone(self.router.allow_migrate("default", "app_models"))
+
+    def test_sticky_primary_after_a_write(self):
+        stick_to_primary(1)
+
+        with replica_reads(owner_id=1):
+            self.assertIsNone(self.router.db_for_read(Task))
+
+        # Other owners still read from the replica
+        with replica_reads(owner_id=2):
+            self.assertEqual(self.router.db_for_read(Task), REPLICA_DB_ALIAS)
+
+    def test_primary_in_a_transaction(self):
+        with replica_reads(owner_id=1), mock.patch.object(
+            connections["default"], "in_atomic_block", True
+        ):
+            self.assertIsNone(self.router.db_for_read(Task))
+
+    @override_settings(DATABASES={"default": settings.DATABASES["default"]})
+    def test_no_replica_configured(self):
+        with replica_reads(owner_id=1):
+            self.assertIsNone(self.router.db_for_read(Task))
+
+
+class ReplicaSettingsTestCase(SimpleTestCase):
+    """A replica requires a cache shared by the server processes"""
+
+    def _load_settings(self, **environment):
+        with mock.patch.dict(os.environ, environment):
+            return runpy.run_module("project_manager.settings")
+
+    def test_per_process_cache_refused(self):
+        for backend in (
+            "django.core.cache.backends.locmem.LocMemCache",
+            "django.core.cache.backends.dummy.DummyCache",
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                self._load_settings(
+                    DATABASE_REPLICA_NAME="replica", CACHE_BACKEND=backend
+                )
+
+    def test_shared_cache_accepted(self):
+        loaded_settings = self._load_settings(
+            DATABASE_REPLICA_NAME="replica",
+            CACHE_BACKEND="django.core.cache.backends.redis.RedisCache",
+        )
+
+        self.assertIn(REPLICA_DB_ALIAS, loaded_settings["DATABASES"])
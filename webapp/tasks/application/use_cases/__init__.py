@@ -1,5 +1,8 @@
 from .create_task import CreateTaskUseCase
 from .edit_task import EditTaskUseCase
+from .export import ExportUseCase
 from .list_task import ListTasksUseCase
 from .start_timer import StartTimerUseCase
 from .stop_timer import StopTimerUseCase
+from .time_report import TimeReportUseCase
+from .weekly_report import WeeklyReportUseCase
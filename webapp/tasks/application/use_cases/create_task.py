@@ -1,4 +1,4 @@
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from webapp.shared import exceptions
 from webapp.shared.infrastructure.repositories import (
@@ -21,7 +21,7 @@ class CreateTaskUseCase:
 
     def execute(
         self,
-        user_id: str,
+        user,
         project_id: str,
         title: str,
         description: Optional[str] = None,
@@ -34,16 +34,84 @@ class CreateTaskUseCase:
         if not existing_project:
             raise exceptions.ProjectNotFoundException("Project not found")
 
-        if not self.project_repository.is_owned_by(existing_project, user_id):
+        if not self.project_repository.is_owned_by(existing_project, user.id):
             raise exceptions.UnauthorizedAccessException(
                 "You are not authorized to create a task on this project"
             )
 
-        # Create task
+        task = self.task_repository.create(
+            self._build_task_data(
+                existing_project, title, description, status, estimated_time
+            )
+        )
+        return task
+
+    def execute_batch(self, user, tasks: List[dict]):
+        """
+        Execute the creation of a batch of tasks, possibly on several projects.
+
+        Projects are fetched and their ownership checked once per distinct project,
+        then every valid task is inserted at once. Returns one result per item, in
+        the order of `tasks`: {"index", "task"} when created, {"index", "error"}
+        otherwise.
+        """
+
+        projects = self.project_repository.get_by_ids(
+            {item["project_id"] for item in tasks}
+        )
+        authorized_project_ids = {
+            project_id
+            for project_id, project in projects.items()
+            if self.project_repository.is_owned_by(project, user.id)
+        }
+
+        results = []
+        tasks_data = []
+        for index, item in enumerate(tasks):
+            if item["project_id"] not in projects:
+                results.append({"index": index, "error": "Project not found"})
+
+            elif item["project_id"] not in authorized_project_ids:
+                results.append(
+                    {
+                        "index": index,
+                        "error": "You are not authorized to create a task on this project",
+                    }
+                )
+
+            else:
+                results.append({"index": index, "task": None})
+                tasks_data.append(
+                    self._build_task_data(
+                        projects[item["project_id"]],
+                        item["title"],
+                        item.get("description"),
+                        item.get("status"),
+                        item.get("estimated_time"),
+                    )
+                )
+
+        created_tasks = iter(self.task_repository.bulk_create(tasks_data))
+        for result in results:
+            if "task" in result:
+                result["task"] = next(created_tasks)
+
+        return results
+
+    @staticmethod
+    def _build_task_data(
+        project,
+        title: str,
+        description: Optional[str] = None,
+        status: Optional[str] = None,
+        estimated_time: Optional[int] = None,
+    ):
+        """Build the data of a new task of a project"""
+
         task_data = {
             "title": title.strip(),
             "description": description or "",
-            "project": existing_project,
+            "project": project,
         }
         if status:
             task_data["status"] = status
@@ -51,5 +119,4 @@ class CreateTaskUseCase:
         if estimated_time:
             task_data["estimated_time"] = estimated_time
 
-        task = self.task_repository.create(task_data)
-        return task
+        return task_data
@@ -12,15 +12,13 @@ class EditTaskUseCase:
 
     def __init__(
         self,
-        user_repository: Union[BaseRepository],
         task_repository: Union[BaseRepository, TaskRepositoryInterface],
     ):
-        self.user_repository = user_repository
         self.task_repository = task_repository
 
     def execute(
         self,
-        user_id: str,
+        user,
         task_id: str,
         title: Optional[str] = None,
         description: Optional[str] = None,
@@ -29,15 +27,14 @@ class EditTaskUseCase:
     ):
         """Execute task editing"""
 
-        existing_user = self.user_repository.get_by_id(user_id)
-        if not existing_user:
+        if not user:
             raise Exception("User not found")
 
         existing_task = self.task_repository.get_by_id(task_id)
-        if not existing_user:
+        if not existing_task:
             raise exceptions.TaskNotFoundException("Task not found")
 
-        if existing_task.project.owner != existing_user:
+        if existing_task.project.owner_id != user.id:
             raise exceptions.UnauthorizedAccessException(
                 "You are not authorized to edit this task"
             )
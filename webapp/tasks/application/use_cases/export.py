@@ -0,0 +1,41 @@
+from typing import Union
+
+from webapp.shared import exceptions
+from webapp.shared.infrastructure.repositories import (
+    BaseRepository,
+    TaskRepositoryInterface,
+    TimeEntryRepositoryInterface,
+)
+
+# Resources that can be exported
+EXPORT_RESOURCES = ("tasks", "time-entries")
+
+
+class ExportUseCase:
+    """Use case for exporting the tasks or the time entries of a user"""
+
+    def __init__(
+        self,
+        task_repository: Union[BaseRepository, TaskRepositoryInterface],
+        time_entry_repository: Union[BaseRepository, TimeEntryRepositoryInterface],
+    ):
+        self.task_repository = task_repository
+        self.time_entry_repository = time_entry_repository
+
+    def execute(self, user, resource: str):
+        """
+        Execute the export of a resource (see EXPORT_RESOURCES). Nothing is read
+        yet: returns the column names and a lazy iterator over the rows (tuples),
+        for the caller to stream.
+        """
+
+        if not user:
+            raise Exception("User not found")
+
+        if resource == "tasks":
+            return self.task_repository.export_by_user(user)
+
+        if resource == "time-entries":
+            return self.time_entry_repository.export_by_user(user)
+
+        raise exceptions.ValidationException(f"Unknown export: {resource}")
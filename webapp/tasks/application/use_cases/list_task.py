@@ -1,11 +1,22 @@
-from typing import Optional, Union
+from functools import partial
+from typing import Optional, Sequence, Union
 
 from webapp.shared import exceptions
+from webapp.shared.infrastructure.concurrent_queries import run_concurrently
+from webapp.shared.infrastructure.database_routing import areplica_reads, replica_reads
 from webapp.shared.infrastructure.repositories import (
     BaseRepository,
     ProjectRepositoryInterface,
     TaskRepositoryInterface,
 )
+from webapp.shared.pagination import (
+    acount_total,
+    apaginate_by_cursor,
+    count_total,
+    decode_cursor,
+    paginate_by_cursor,
+    with_cursor_fields,
+)
 
 
 class ListTasksUseCase:
@@ -14,59 +25,197 @@ class ListTasksUseCase:
     def __init__(
         self,
         project_repository: Union[BaseRepository, ProjectRepositoryInterface],
-        user_repository: Union[BaseRepository],
         task_repository: Union[TaskRepositoryInterface],
     ):
         self.project_repository = project_repository
-        self.user_repository = user_repository
         self.task_repository = task_repository
 
     def execute(
         self,
-        user_id: str,
+        user,
+        page: int,
+        size: int,
+        query: Optional[str] = "",
+        status: Optional[str] = "",
+        project_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        approximate_total: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        """
+        Execute tasks listing with optional filters and pagination.
+
+        When `cursor` is given (an empty string for the first page), keyset
+        pagination on (created_at, id) is used instead of page/size: only `size + 1`
+        rows are read and the total is computed only if `with_total` is True.
+        With `approximate_total`, counting stops at a cap and bigger totals are
+        reported as e.g. "1000+".
+        With `fields`, the listed items are dicts of these values (see the lean list
+        serializers) instead of model instances.
+        """
+
+        if not user:
+            raise Exception("User not found")
+
+        with replica_reads(user.id):
+            # Building filters
+            filters = {}
+            if query:
+                filters["search_term"] = query
+
+            if status:
+                filters["status"] = status
+
+            if project_id:
+                filters["project"] = self._check_project_access(
+                    self.project_repository.get_by_id(project_id), user
+                )
+
+            if cursor is not None:
+                if cursor:
+                    filters["cursor"] = decode_cursor(cursor)
+
+                searched_tasks = self.task_repository.get_by_user(
+                    user, filters, fields=with_cursor_fields(fields)
+                )
+                read_page = partial(paginate_by_cursor, searched_tasks, size)
+                if not with_total:
+                    tasks, more, next_cursor = read_page()
+                    return {
+                        "size": size,
+                        "more": more,
+                        "next_cursor": next_cursor,
+                        "tasks": tasks,
+                    }
+
+                count_filters = {
+                    key: value for key, value in filters.items() if key != "cursor"
+                }
+                (tasks, more, next_cursor), total = run_concurrently(
+                    read_page,
+                    partial(
+                        count_total,
+                        partial(self.task_repository.count_by_user, user, count_filters),
+                        approximate_total,
+                    ),
+                )
+                return {
+                    "size": size,
+                    "more": more,
+                    "next_cursor": next_cursor,
+                    "tasks": tasks,
+                    "total": total,
+                }
+
+            # Searches are ordered by relevance, keyset pages keep the (created_at, id)
+            # order
+            searched_tasks = self.task_repository.get_by_user(
+                user, filters, ranked=True, fields=fields
+            )
+
+            # Manage pagination, one extra row tells if there is a next page
+            start = (page - 1) * size
+            end = page * size
+            # The page and the total are read at once (see PARALLEL_READ_QUERIES)
+            tasks, total = run_concurrently(
+                partial(list, searched_tasks[start : end + 1]),
+                partial(
+                    count_total,
+                    partial(self.task_repository.count_by_user, user, filters),
+                    approximate_total,
+                ),
+            )
+
+            return {
+                "page": page,
+                "size": size,
+                "total": total,
+                "more": len(tasks) > size,
+                "tasks": tasks[:size],
+            }
+
+    async def aexecute(
+        self,
+        user,
         page: int,
         size: int,
         query: Optional[str] = "",
         status: Optional[str] = "",
         project_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        approximate_total: bool = False,
+        fields: Optional[Sequence[str]] = None,
     ):
-        """Execute tasks listing with optional filters and pagination"""
+        """Async variant of `execute`, reading the tasks with the async ORM"""
 
-        existing_user = self.user_repository.get_by_id(user_id)
-        if not existing_user:
+        if not user:
             raise Exception("User not found")
 
-        # Building filters
-        filters = {}
-        if query:
-            filters["search_term"] = query
+        async with areplica_reads(user.id):
+            filters = {}
+            if query:
+                filters["search_term"] = query
 
-        if status:
-            filters["status"] = status
+            if status:
+                filters["status"] = status
 
-        if project_id:
-            existing_project = self.project_repository.get_by_id(project_id)
-            if not existing_project:
-                raise exceptions.ProjectNotFoundException("Project not found")
+            if project_id:
+                filters["project"] = self._check_project_access(
+                    await self.project_repository.aget_by_id(project_id), user
+                )
 
-            if not self.project_repository.is_owned_by(existing_project, user_id):
-                raise exceptions.UnauthorizedAccessException(
-                    "You are not authorized to access on this project"
+            if cursor is not None:
+                if cursor:
+                    filters["cursor"] = decode_cursor(cursor)
+
+                searched_tasks = self.task_repository.get_by_user(
+                    user, filters, fields=with_cursor_fields(fields)
                 )
+                tasks, more, next_cursor = await apaginate_by_cursor(searched_tasks, size)
+                paginated_tasks = {
+                    "size": size,
+                    "more": more,
+                    "next_cursor": next_cursor,
+                    "tasks": tasks,
+                }
+                if with_total:
+                    filters.pop("cursor", None)
+                    paginated_tasks["total"] = await acount_total(
+                        partial(self.task_repository.acount_by_user, user, filters),
+                        approximate_total,
+                    )
+
+                return paginated_tasks
+
+            searched_tasks = self.task_repository.get_by_user(
+                user, filters, ranked=True, fields=fields
+            )
+            start = (page - 1) * size
+            end = page * size
+            tasks = [task async for task in searched_tasks[start : end + 1]]
+            total = await acount_total(
+                partial(self.task_repository.acount_by_user, user, filters),
+                approximate_total,
+            )
 
-            filters["project"] = existing_project
+            return {
+                "page": page,
+                "size": size,
+                "total": total,
+                "more": len(tasks) > size,
+                "tasks": tasks[:size],
+            }
 
-        searched_tasks = self.task_repository.get_by_user(existing_user, filters)
+    def _check_project_access(self, project, user):
+        """Get the project to filter on, if it exists and is owned by the user"""
+        if not project:
+            raise exceptions.ProjectNotFoundException("Project not found")
 
-        # Manage pagination
-        start = (page - 1) * size
-        end = page * size
-        total = len(searched_tasks)
+        if not self.project_repository.is_owned_by(project, user.id):
+            raise exceptions.UnauthorizedAccessException(
+                "You are not authorized to access on this project"
+            )
 
-        return {
-            "page": page,
-            "size": size,
-            "total": total,
-            "more": end < total,
-            "tasks": searched_tasks[start:end] if searched_tasks else [],
-        }
+        return project
@@ -0,0 +1,88 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from webapp.shared import exceptions
+from webapp.shared.infrastructure.repositories import (
+    BaseRepository,
+    TimeEntryRepositoryInterface,
+)
+
+# Range of the report when no start date is given
+DEFAULT_REPORT_DAYS = 30
+
+
+class TimeReportUseCase:
+    """Use case for the time report of a user over a date range"""
+
+    def __init__(
+        self,
+        time_entry_repository: Union[BaseRepository, TimeEntryRepositoryInterface],
+    ):
+        self.time_entry_repository = time_entry_repository
+
+    def execute(
+        self,
+        user,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        period: str = "day",
+        group_by: Optional[str] = None,
+        tz_name: Optional[str] = None,
+        max_rows: Optional[int] = None,
+        stream: bool = False,
+    ):
+        """
+        Execute the time report: the total time and number of time entries per
+        period (day, week or month) and optionally per project or task, between
+        two dates included, in the time zone `tz_name` (UTC by default).
+
+        At most `max_rows` rows are returned, **truncated** telling whether there
+        were more. With `stream`, **rows** is an unbounded iterator instead, for the
+        caller to stream.
+        """
+
+        if not user:
+            raise Exception("User not found")
+
+        try:
+            tz = ZoneInfo(tz_name or "UTC")
+
+        except (ZoneInfoNotFoundError, ValueError):
+            raise exceptions.ValidationException(f"Unknown time zone: {tz_name}")
+
+        end_date = end_date or datetime.now(tz).date()
+        start_date = start_date or end_date - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+        if start_date > end_date:
+            raise exceptions.ValidationException(
+                "start_date must be lower or equal to end_date"
+            )
+
+        rows = self.time_entry_repository.get_time_report(
+            user,
+            datetime.combine(start_date, time.min, tzinfo=tz),
+            datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=tz),
+            period=period,
+            group_by=group_by,
+            tz=tz,
+        )
+        report = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "period": period,
+            "group_by": group_by,
+            "time_zone": tz.key,
+        }
+
+        if stream:
+            report["rows"] = rows.iterator(chunk_size=1000)
+            return report
+
+        # One extra row tells if the report was truncated
+        if max_rows:
+            rows = rows[: max_rows + 1]
+
+        rows = list(rows)
+        report["truncated"] = bool(max_rows) and len(rows) > max_rows
+        report["rows"] = rows[:max_rows] if max_rows else rows
+        return report
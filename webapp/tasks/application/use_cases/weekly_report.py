@@ -0,0 +1,73 @@
+from datetime import date, datetime, timedelta
+from typing import Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from webapp.shared import exceptions
+from webapp.shared.infrastructure.repositories import (
+    BaseRepository,
+    TimeEntryRepositoryInterface,
+)
+
+
+class WeeklyReportUseCase:
+    """Use case for the weekly time tracking report of a user"""
+
+    def __init__(
+        self,
+        time_entry_repository: Union[BaseRepository, TimeEntryRepositoryInterface],
+    ):
+        self.time_entry_repository = time_entry_repository
+
+    def execute(
+        self,
+        user,
+        week_start: Optional[date] = None,
+        tz_name: Optional[str] = None,
+        include_entries: bool = False,
+    ):
+        """
+        Execute the weekly report: the total time of the week and of each of its 7
+        days, in the time zone `tz_name` (UTC by default). The week starts on
+        `week_start`, by default on the monday of the current week.
+        """
+
+        if not user:
+            raise Exception("User not found")
+
+        try:
+            tz = ZoneInfo(tz_name or "UTC")
+
+        except (ZoneInfoNotFoundError, ValueError):
+            raise exceptions.ValidationException(f"Unknown time zone: {tz_name}")
+
+        if not week_start:
+            today = datetime.now(tz).date()
+            week_start = today - timedelta(days=today.weekday())
+
+        summary = self.time_entry_repository.get_weekly_summary(
+            user, week_start, tz=tz, include_entries=include_entries
+        )
+
+        days = []
+        for offset in range(7):
+            day = week_start + timedelta(days=offset)
+            day_summary = summary["daily_summary"].get(
+                day, {"total_time": 0, "entries_count": 0, "entries": []}
+            )
+            day_report = {
+                "date": day,
+                "total_time": day_summary["total_time"],
+                "entries_count": day_summary["entries_count"],
+            }
+            if include_entries:
+                day_report["entries"] = day_summary["entries"]
+
+            days.append(day_report)
+
+        return {
+            "week_start": summary["week_start"],
+            "week_end": summary["week_end"],
+            "time_zone": tz.key,
+            "total_time": summary["total_time"],
+            "days": days,
+        }
@@ -1,11 +1,33 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Count, F, Prefetch, Q, Sum
 
 from app_models.models.task import Task
 from app_models.models.time_entry import TimeEntry
+from webapp.projects.infrastructure.repositories import DashboardRollupRepository
+from webapp.shared import exceptions
+from webapp.shared.infrastructure.data_versions import notify_owner_data_changed
 from webapp.shared.infrastructure.repositories import (
     BaseRepository,
     TaskRepositoryInterface,
 )
+from webapp.shared.search import search_filter, search_rank
+
+# Columns of the task export
+TASK_EXPORT_FIELDS = (
+    "id",
+    "project_id",
+    "project__title",
+    "title",
+    "description",
+    "status",
+    "estimated_time",
+    "spent_time",
+    "created_at",
+    "updated_at",
+)
 
 
 class TaskRepository(BaseRepository, TaskRepositoryInterface):
@@ -29,14 +51,66 @@ class TaskRepository(BaseRepository, TaskRepositoryInterface):
             .order_by("-created_at")
         )
 
-    def get_by_user(self, user, filters=None):
-        """Get all tasks accessible by user with optional filters"""
-        q = Q(project__owner=user)
+    def get_by_user(self, user, filters=None, ranked=False, fields=None):
+        """
+        Get all tasks accessible by user with optional filters. With `ranked` and a
+        search term, the most relevant tasks come first. With `fields`, the tasks are
+        read as dicts of these values instead of model instances.
+        """
+        tasks = self._filter_by_user(user, filters).select_related(
+            "project", "project__owner"
+        )
+        ordering = ["-created_at", "-id"]
+        search_term = (filters or {}).get("search_term", "")
+        if ranked and search_term:
+            tasks = tasks.annotate(search_rank=search_rank(search_term))
+            ordering.insert(0, "-search_rank")
+
+        tasks = tasks.order_by(*ordering)
+        if fields:
+            tasks = tasks.values(*fields)
+
+        return tasks
+
+    def export_by_user(self, user, filters=None, chunk_size=None):
+        """
+        Stream the TASK_EXPORT_FIELDS values of the tasks accessible by user, read
+        `chunk_size` rows at a time (server-side cursor on PostgreSQL).
+
+        :return: The column names and an iterator over the rows (tuples)
+        """
+        rows = (
+            self.get_by_user(user, filters)
+            .values_list(*TASK_EXPORT_FIELDS)
+            .iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE)
+        )
+        return [field.replace("__", "_") for field in TASK_EXPORT_FIELDS], rows
+
+    def count_by_user(self, user, filters=None, limit=None):
+        """
+        Count tasks accessible by user with optional filters, with a lean COUNT(*)
+        query (no joins for related data, no ordering). With `limit`, counting stops
+        after `limit + 1` rows so the caller can report an approximate total.
+        """
+        return self._count_query(user, filters, limit).count()
+
+    async def acount_by_user(self, user, filters=None, limit=None):
+        """Async variant of `count_by_user`"""
+        return await self._count_query(user, filters, limit).acount()
+
+    def _count_query(self, user, filters=None, limit=None):
+        tasks = self._filter_by_user(user, filters).order_by()
+        if limit is not None:
+            tasks = tasks.values("id")[: limit + 1]
+
+        return tasks
+
+    def _filter_by_user(self, user, filters=None):
+        """Build the filtered queryset of tasks accessible by user"""
+        q = Q(owner=user)
         if filters:
             if filters.get("search_term", ""):
-                q &= Q(title__icontains=filters["search_term"]) | Q(
-                    description__icontains=filters["search_term"]
-                )
+                q &= search_filter(filters["search_term"])
 
             if filters.get("status", ""):
                 q &= Q(status=filters["status"])
@@ -44,11 +118,14 @@ class TaskRepository(BaseRepository, TaskRepositoryInterface):
             if filters.get("project", ""):
                 q &= Q(project=filters["project"])
 
-        return (
-            Task.objects.filter(q)
-            .select_related("project", "project__owner")
-            .order_by("-created_at")
-        )
+            if filters.get("cursor", ""):
+                # Keyset pagination: only rows after the (created_at, id) position
+                cursor_created_at, cursor_id = filters["cursor"]
+                q &= Q(created_at__lt=cursor_created_at) | Q(
+                    created_at=cursor_created_at, id__lt=cursor_id
+                )
+
+        return Task.objects.filter(q)
 
     def get_with_active_timer(self, user):
         """Get tasks with active timer information"""
@@ -60,25 +137,89 @@ class TaskRepository(BaseRepository, TaskRepositoryInterface):
             )
         )
 
+    @transaction.atomic
     def create(self, task_data):
         """Create new task"""
         task = Task.objects.create(**task_data)
+        DashboardRollupRepository().apply_task_change(
+            task.project_id, after=DashboardRollupRepository.task_snapshot(task)
+        )
+        notify_owner_data_changed(task.owner_id)
         return task
 
+    @transaction.atomic
+    def bulk_create(self, tasks_data, batch_size=None):
+        """
+        Create tasks with batched INSERTs (`batch_size` tasks per statement) in a
+        single transaction, then update the rollup of each project once
+        """
+        tasks = [
+            Task(owner_id=task_data["project"].owner_id, **task_data)
+            for task_data in tasks_data
+        ]
+        Task.objects.bulk_create(
+            tasks, batch_size=batch_size or settings.TASK_BULK_CREATE_BATCH_SIZE
+        )
+
+        snapshots_by_project = defaultdict(list)
+        for task in tasks:
+            snapshots_by_project[task.project_id].append(
+                DashboardRollupRepository.task_snapshot(task)
+            )
+
+        for project_id, snapshots in snapshots_by_project.items():
+            DashboardRollupRepository().apply_tasks_created(project_id, snapshots)
+
+        notify_owner_data_changed(*{task.owner_id for task in tasks})
+        return tasks
+
+    @transaction.atomic
     def update(self, task, data):
-        """Update task data"""
+        """
+        Update task data. The row is locked and re-read first, so that the change
+        applied to the rollup starts from its current values
+        """
+        self._lock_and_refresh(task)
+        before = DashboardRollupRepository.task_snapshot(task)
+        updated_fields = ["updated_at"]
         for field, value in data.items():
             if hasattr(task, field) and field not in ["project", "spent_time"]:
                 setattr(task, field, value)
-
-        task.save()
+                updated_fields.append(field)
+
+        # Only the edited columns: the spent time is incremented concurrently by the
+        # time entries, a full save would write back the value loaded before
+        task.save(update_fields=updated_fields)
+        DashboardRollupRepository().apply_task_change(
+            task.project_id,
+            before=before,
+            after=DashboardRollupRepository.task_snapshot(task),
+        )
+        notify_owner_data_changed(task.owner_id)
         return task
 
+    @transaction.atomic
     def delete(self, task):
-        """Delete task"""
+        """Delete task, its current values are removed from the rollup"""
+        self._lock_and_refresh(task)
+        before = DashboardRollupRepository.task_snapshot(task)
         task.delete()
+        DashboardRollupRepository().apply_task_change(task.project_id, before=before)
+        notify_owner_data_changed(task.owner_id)
         return True
 
+    @staticmethod
+    def _lock_and_refresh(task):
+        """
+        Lock the row of a task until the end of the transaction and re-read it: a
+        timer stop or an edit committed since the task was loaded is not missed
+        """
+        try:
+            task.refresh_from_db(from_queryset=Task.objects.select_for_update())
+
+        except Task.DoesNotExist:
+            raise exceptions.TaskNotFoundException("Task not found")
+
     def get_overdue_tasks(self, user):
         """Get tasks that are overdue (spent more than estimated)"""
         return self.get_by_user(user).filter(
@@ -94,9 +235,3 @@ class TaskRepository(BaseRepository, TaskRepositoryInterface):
         return self.get_by_user(user).aggregate(
             total_estimated=Sum("estimated_time"), total_spent=Sum("spent_time")
         )
-
-    def update_spent_time(self, task, duration):
-        """Update task spent time by adding duration"""
-        task.spent_time += duration
-        task.save(update_fields=["spent_time"])
-        return task
@@ -1,12 +1,73 @@
-from django.db.models import Sum
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Case,
+    Count,
+    DateField,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import (
+    Coalesce,
+    TruncDate,
+    TruncDay,
+    TruncMonth,
+    TruncWeek,
+)
 from django.utils import timezone
 
+from app_models.models.task import Task
 from app_models.models.time_entry import TimeEntry
+from webapp.projects.infrastructure.repositories import DashboardRollupRepository
+from webapp.shared import exceptions
+from webapp.shared.infrastructure.data_versions import notify_owner_data_changed
 from webapp.shared.infrastructure.repositories import (
     BaseRepository,
     TimeEntryRepositoryInterface,
 )
 
+# Periods of the time report, with the function truncating the start times to them
+TIME_REPORT_PERIODS = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+
+# Groupings of the time report: the fields and the aliased expressions of a group
+TIME_REPORT_GROUPS = {
+    None: ((), {}),
+    "project": (
+        (),
+        {"project_id": F("task__project_id"), "project_title": F("task__project__title")},
+    ),
+    "task": (
+        ("task_id",),
+        {
+            "task_title": F("task__title"),
+            "project_id": F("task__project_id"),
+            "project_title": F("task__project__title"),
+        },
+    ),
+}
+
+# Columns of the time entry export
+TIME_ENTRY_EXPORT_FIELDS = (
+    "id",
+    "task_id",
+    "task__title",
+    "task__project_id",
+    "task__project__title",
+    "user__username",
+    "start_time",
+    "end_time",
+    "duration",
+    "is_active",
+)
+
 
 class TimeEntryRepository(BaseRepository, TimeEntryRepositoryInterface):
     """Repository for TimeEntry entity operations"""
@@ -32,21 +93,35 @@ class TimeEntryRepository(BaseRepository, TimeEntryRepositoryInterface):
     def get_by_user(self, user):
         """Get all time entries for a user"""
         return (
-            TimeEntry.objects.filter(task__project__owner=user)
+            TimeEntry.objects.filter(owner=user)
             .select_related("user", "task", "task__project")
             .order_by("-start_time")
         )
 
+    def export_by_user(self, user, chunk_size=None):
+        """
+        Stream the TIME_ENTRY_EXPORT_FIELDS values of the time entries of a user,
+        read `chunk_size` rows at a time (server-side cursor on PostgreSQL).
+
+        :return: The column names and an iterator over the rows (tuples)
+        """
+        rows = (
+            self.get_by_user(user)
+            .values_list(*TIME_ENTRY_EXPORT_FIELDS)
+            .iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE)
+        )
+        return [field.replace("__", "_") for field in TIME_ENTRY_EXPORT_FIELDS], rows
+
     def get_by_user_and_date(self, user, date):
         """Get time entries for user on specific date"""
-        return TimeEntry.objects.filter(
-            task__project__owner=user, start_time__date=date
-        ).select_related("task", "task__project")
+        return TimeEntry.objects.filter(owner=user, start_time__date=date).select_related(
+            "task", "task__project"
+        )
 
     def get_active_timer_for_user(self, user):
         """Get active timer for user"""
         return (
-            TimeEntry.objects.filter(task__project__owner=user, is_active=True)
+            TimeEntry.objects.filter(owner=user, is_active=True)
             .select_related("task", "task__project")
             .first()
         )
@@ -63,43 +138,267 @@ class TimeEntryRepository(BaseRepository, TimeEntryRepositoryInterface):
         """Check if task has an active timer"""
         return TimeEntry.objects.filter(task=task, is_active=True).exists()
 
+    @transaction.atomic
+    def start_timer(self, user, task, start_time):
+        """
+        Start a timer of a user on a task, after stopping the other active timers of
+        the user, in a single transaction. The active timers are locked while they
+        are checked and stopped, and the one-active-timer-per-owner constraint
+        rejects concurrent starts.
+
+        :return: The new timer, None if the task already has an active timer
+        :raises ConcurrentTimerStartException: When a timer of the user was started
+            on another task concurrently
+        """
+        active_timers = TimeEntry.objects.select_for_update().filter(
+            owner=user, is_active=True
+        )
+        if any(timer.task_id == task.id for timer in active_timers):
+            return None
+
+        self.stop_active_timers_for_user(user)
+
+        try:
+            with transaction.atomic():
+                timer = TimeEntry.objects.create(
+                    user=user, task=task, start_time=start_time, is_active=True
+                )
+
+        except IntegrityError:
+            # A timer of the owner was started concurrently, on this task or another
+            if self.has_active_timer(task):
+                return None
+
+            raise exceptions.ConcurrentTimerStartException(
+                "Another timer of the user was started concurrently"
+            )
+
+        notify_owner_data_changed(timer.owner_id)
+        return timer
+
+    @transaction.atomic
+    def stop_timer(self, user, task, end_time):
+        """
+        Stop the active timer of a user on a task and add its duration to the task,
+        in a single transaction with the timer locked, so that concurrent stops
+        account for it only once.
+
+        :return: The stopped timer, None if the task has no active timer
+        """
+        timer = (
+            TimeEntry.objects.select_for_update()
+            .filter(task=task, user=user, is_active=True)
+            .first()
+        )
+        if not timer:
+            return None
+
+        timer.end_time = end_time
+        timer.duration = TimeEntry.compute_duration(timer.start_time, end_time)
+        timer.is_active = False
+        timer.save()
+
+        self._add_spent_time({(task.id, task.project_id): timer.duration})
+        notify_owner_data_changed(timer.owner_id)
+        return timer
+
+    @transaction.atomic
     def create(self, entry_data):
-        """Create new time entry"""
+        """Create new time entry, its duration is added to the task spent time"""
         entry = TimeEntry.objects.create(**entry_data)
+        self._add_spent_time(
+            {(entry.task_id, entry.task.project_id): entry.duration or 0}
+        )
+        notify_owner_data_changed(entry.owner_id)
         return entry
 
+    @transaction.atomic
     def update(self, entry, data):
-        """Update time entry data"""
+        """
+        Update time entry data, the change of its duration is applied to the task
+        spent time. The duration is recomputed when the times change without it.
+        When the entry moves to another task, its previous duration is removed from
+        the previous task and its new duration added to the new one, and it takes
+        the owner of the new task.
+        """
+        previous_duration = entry.duration or 0
+        previous_task = (entry.task_id, entry.task.project_id)
+        previous_owner_id = entry.owner_id
         for field, value in data.items():
             if hasattr(entry, field):
                 setattr(entry, field, value)
 
+        if entry.task_id != previous_task[0]:
+            entry.owner_id = entry.task.owner_id
+
+        times_changed = "start_time" in data or "end_time" in data
+        if times_changed and "duration" not in data and entry.end_time:
+            entry.duration = TimeEntry.compute_duration(entry.start_time, entry.end_time)
+
         entry.save()
+        spent_times = Counter({previous_task: -previous_duration})
+        spent_times[(entry.task_id, entry.task.project_id)] += entry.duration or 0
+        self._add_spent_time(spent_times)
+        notify_owner_data_changed(previous_owner_id, entry.owner_id)
         return entry
 
+    @transaction.atomic
     def delete(self, entry):
-        """Delete time entry"""
+        """Delete time entry, its duration is removed from the task spent time"""
         entry.delete()
+        self._add_spent_time(
+            {(entry.task_id, entry.task.project_id): -(entry.duration or 0)}
+        )
+        notify_owner_data_changed(entry.owner_id)
         return True
 
+    @transaction.atomic
     def stop_active_timers_for_user(self, user):
-        """Stop all active timers for a user"""
-        active_timers = TimeEntry.objects.filter(
-            task__project__owner=user, is_active=True
+        """
+        Stop all active timers for a user with set-based updates: one UPDATE closing
+        the timers, one UPDATE adding their durations to the tasks, and one rollup
+        UPDATE per project. Returns the number of stopped timers.
+        """
+        active_timers = list(
+            TimeEntry.objects.select_for_update(of=("self",))
+            .filter(owner=user, is_active=True)
+            .values("id", "task_id", "task__project_id", "start_time")
         )
+        if not active_timers:
+            return 0
 
         current_time = timezone.now()
+        durations = {}
+        spent_times = Counter()
         for timer in active_timers:
-            timer.end_time = current_time
-            timer.duration = (current_time - timer.start_time).seconds // 60
-            timer.is_active = False
-            timer.save()
+            duration = TimeEntry.compute_duration(timer["start_time"], current_time)
+            durations[timer["id"]] = duration
+            spent_times[(timer["task_id"], timer["task__project_id"])] += duration
+
+        stopped = TimeEntry.objects.filter(id__in=durations, is_active=True).update(
+            end_time=current_time,
+            duration=self._case_by_id(durations),
+            is_active=False,
+            updated_at=current_time,
+        )
+        self._add_spent_time(spent_times)
+        notify_owner_data_changed(user.id)
+        return stopped
+
+    def _add_spent_time(self, spent_times):
+        """
+        The single path updating the spent time counters from time entries: add
+        minutes to the tasks with one F() UPDATE and to the rollups of their
+        projects.
+
+        :param spent_times: Minutes to add (negative to remove) by (task ID,
+            project ID)
+        """
+        task_minutes = Counter()
+        project_minutes = Counter()
+        for (task_id, project_id), minutes in spent_times.items():
+            task_minutes[task_id] += minutes
+            project_minutes[project_id] += minutes
+
+        task_minutes = {id: minutes for id, minutes in task_minutes.items() if minutes}
+        if not task_minutes:
+            return
+
+        Task.objects.filter(id__in=task_minutes).update(
+            spent_time=F("spent_time") + self._case_by_id(task_minutes)
+        )
+        for project_id, minutes in project_minutes.items():
+            DashboardRollupRepository().apply_spent_time(project_id, minutes)
+
+    def reconcile_spent_time(self, fix=True, batch_size=500):
+        """
+        Recompute the durations of the stopped time entries from their times, then
+        the spent time of the tasks from their time entries, by batches of rows.
+        Drifted tasks are fixed with a subquery summing their entries at UPDATE
+        time, so that concurrent timer stops are not overwritten.
+
+        :param fix: Write the recomputed values, otherwise only report the drift
+        :param batch_size: Number of rows read per query
+        :return: The IDs of the drifted time entries and of the drifted tasks
+        """
+        drifted_entry_ids = []
+        stopped_entries = TimeEntry.objects.filter(
+            is_active=False, end_time__isnull=False
+        ).order_by("id")
+        last_id = ""
+        while True:
+            batch = list(
+                stopped_entries.filter(id__gt=last_id).values(
+                    "id", "start_time", "end_time", "duration"
+                )[:batch_size]
+            )
+            if not batch:
+                break
+
+            last_id = batch[-1]["id"]
+            durations = {}
+            for entry in batch:
+                duration = TimeEntry.compute_duration(
+                    entry["start_time"], entry["end_time"]
+                )
+                if entry["duration"] != duration:
+                    durations[entry["id"]] = duration
+
+            drifted_entry_ids.extend(durations)
+            if fix and durations:
+                TimeEntry.objects.filter(id__in=durations).update(
+                    duration=self._case_by_id(durations)
+                )
+
+        drifted_task_ids = []
+        drifted_project_ids = set()
+        tasks = Task.objects.order_by("id")
+        last_id = ""
+        while True:
+            batch = list(
+                tasks.filter(id__gt=last_id)
+                .values("id", "project_id", "spent_time")
+                .annotate(entries_time=Sum("time_entries__duration"))[:batch_size]
+            )
+            if not batch:
+                break
+
+            last_id = batch[-1]["id"]
+            task_ids = []
+            for task in batch:
+                if task["spent_time"] != (task["entries_time"] or 0):
+                    task_ids.append(task["id"])
+                    drifted_project_ids.add(task["project_id"])
+
+            drifted_task_ids.extend(task_ids)
+            if fix and task_ids:
+                entries_time = (
+                    TimeEntry.objects.filter(task_id=OuterRef("id"))
+                    .values("task_id")
+                    .annotate(total=Sum("duration"))
+                    .values("total")
+                )
+                Task.objects.filter(id__in=task_ids).update(
+                    spent_time=Coalesce(Subquery(entries_time), 0)
+                )
+                notify_owner_data_changed(
+                    *Task.objects.filter(id__in=task_ids).values_list(
+                        "owner_id", flat=True
+                    )
+                )
 
-            # Update task spent time
-            timer.task.spent_time += timer.duration
-            timer.task.save(update_fields=["spent_time"])
+        if fix and drifted_project_ids:
+            DashboardRollupRepository().rebuild(project_ids=drifted_project_ids)
 
-        return active_timers.count()
+        return drifted_entry_ids, drifted_task_ids
+
+    @staticmethod
+    def _case_by_id(values):
+        """Build a CASE expression giving its value to each row ID"""
+        return Case(
+            *[When(id=id, then=Value(value)) for id, value in values.items()],
+            output_field=IntegerField(),
+        )
 
     def get_time_summary_for_project(self, project):
         """Get time summary for a project"""
@@ -119,32 +418,86 @@ class TimeEntryRepository(BaseRepository, TimeEntryRepositoryInterface):
             "user", "task"
         )
 
-    def get_weekly_summary(self, user, week_start):
-        """Get weekly time tracking summary"""
-        week_end = week_start + timezone.timedelta(days=7)
+    def get_weekly_summary(self, user, week_start, tz=None, include_entries=False):
+        """
+        Get weekly time tracking summary, the entries being grouped by day in the
+        database: one row per day with its total time and number of entries.
 
-        entries = TimeEntry.objects.filter(
-            task__project__owner=user,
-            start_time__gte=week_start,
-            start_time__lt=week_end,
-            duration__isnull=False,
-        ).select_related("task", "task__project")
+        :param week_start: First day (date) of the week
+        :param tz: Time zone of the days, the current time zone if None
+        :param include_entries: Also stream the entries of each day (as dicts),
+            in a second query
+        """
+        tz = tz or timezone.get_current_timezone()
+        week_end = week_start + timedelta(days=7)
 
-        total_time = entries.aggregate(total=Sum("duration"))["total"]
+        entries = self._filter_stopped_by_owner(
+            user,
+            datetime.combine(week_start, time.min, tzinfo=tz),
+            datetime.combine(week_end, time.min, tzinfo=tz),
+        ).annotate(day=TruncDate("start_time", tzinfo=tz))
 
-        # Group by day
-        daily_summary = {}
-        for entry in entries:
-            day = entry.start_time.date()
-            if day not in daily_summary:
-                daily_summary[day] = {"entries": [], "total_time": 0}
+        daily_summary = {
+            row["day"]: {
+                "total_time": row["total_time"],
+                "entries_count": row["entries_count"],
+            }
+            for row in entries.values("day")
+            .annotate(total_time=Sum("duration"), entries_count=Count("id"))
+            .order_by("day")
+        }
+
+        if include_entries:
+            for day_summary in daily_summary.values():
+                day_summary["entries"] = []
 
-            daily_summary[day]["entries"].append(entry)
-            daily_summary[day]["total_time"] += entry.duration
+            day_entries = entries.values(
+                "id",
+                "task_id",
+                "start_time",
+                "end_time",
+                "duration",
+                "day",
+                task_title=F("task__title"),
+            ).order_by("start_time")
+            for entry in day_entries.iterator(chunk_size=500):
+                daily_summary[entry.pop("day")]["entries"].append(entry)
 
         return {
             "week_start": week_start,
             "week_end": week_end,
-            "total_time": total_time or 0,
+            "total_time": sum(day["total_time"] for day in daily_summary.values()),
             "daily_summary": daily_summary,
         }
+
+    def get_time_report(
+        self, user, start_time, end_time, period="day", group_by=None, tz=None
+    ):
+        """
+        Aggregate the time entries of a user started between two times in the
+        database: one row per period (see TIME_REPORT_PERIODS, in the time zone
+        `tz`) and per project or task with `group_by` (see TIME_REPORT_GROUPS),
+        with its total time and number of entries.
+
+        :return: A lazy queryset of dicts ordered by period, to slice or to stream
+        """
+        tz = tz or timezone.get_current_timezone()
+        truncate = TIME_REPORT_PERIODS[period]
+        group_fields, group_expressions = TIME_REPORT_GROUPS[group_by]
+
+        return (
+            self._filter_stopped_by_owner(user, start_time, end_time)
+            .annotate(period=truncate("start_time", tzinfo=tz, output_field=DateField()))
+            .values("period", *group_fields, **group_expressions)
+            .annotate(total_time=Sum("duration"), entries_count=Count("id"))
+            .order_by("period", *group_expressions, *group_fields)
+        )
+
+    def _filter_stopped_by_owner(self, user, start_time, end_time):
+        """Filter the stopped time entries of a user started in a time range"""
+        return TimeEntry.objects.filter(
+            owner=user,
+            start_time__gte=start_time,
+            start_time__lt=end_time,
+            duration__isnull=False,
+        )
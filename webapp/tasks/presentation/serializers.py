@@ -1,6 +1,10 @@
 from rest_framework import serializers
 
 from app_models.models.task import Task
+from webapp.tasks.infrastructure.repositories.time_entry_repository import (
+    TIME_REPORT_GROUPS,
+    TIME_REPORT_PERIODS,
+)
 
 
 class CreateTaskSerializer(serializers.ModelSerializer):
@@ -21,3 +25,28 @@ class EditTaskSerializer(serializers.ModelSerializer):
 
 class StartTimerSerializer(serializers.Serializer):
     task_id = serializers.CharField()
+
+
+class WeeklyReportSerializer(serializers.Serializer):
+    week_start = serializers.DateField(required=False)
+    tz = serializers.CharField(required=False)
+    include_entries = serializers.BooleanField(required=False, default=False)
+
+
+class TimeReportSerializer(serializers.Serializer):
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    period = serializers.ChoiceField(
+        choices=list(TIME_REPORT_PERIODS), required=False, default="day"
+    )
+    group_by = serializers.ChoiceField(
+        choices=[group for group in TIME_REPORT_GROUPS if group], required=False
+    )
+    tz = serializers.CharField(required=False)
+    stream = serializers.BooleanField(required=False, default=False)
+
+
+class ExportSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+        choices=["csv", "ndjson"], required=False, default="csv"
+    )
@@ -1,17 +1,32 @@
+from django.conf import settings
 from django.urls import path
 
 from webapp.tasks.presentation.views import (
+    AsyncRetrievePaginatedTasksAPIView,
+    BulkCreateTaskAPIView,
     CreateTaskAPIView,
     EditTaskAPIView,
+    ExportAPIView,
     RetrievePaginatedTasksAPIView,
     StartTaskTimerAPIView,
     StopTaskTimerAPIView,
+    TimeReportAPIView,
+    WeeklyReportAPIView,
 )
 
+if settings.ASYNC_VIEWS:
+    list_view = AsyncRetrievePaginatedTasksAPIView
+else:
+    list_view = RetrievePaginatedTasksAPIView
+
 urlpatterns = [
     path("create", CreateTaskAPIView.as_view()),
-    path("list/", RetrievePaginatedTasksAPIView.as_view()),
+    path("bulk-create", BulkCreateTaskAPIView.as_view()),
+    path("list/", list_view.as_view()),
     path("<str:id>/edit", EditTaskAPIView.as_view()),
     path("start-timer", StartTaskTimerAPIView.as_view()),
     path("stop-timer", StopTaskTimerAPIView.as_view()),
+    path("weekly-report", WeeklyReportAPIView.as_view()),
+    path("time-report", TimeReportAPIView.as_view()),
+    path("export/<str:resource>", ExportAPIView.as_view()),
 ]
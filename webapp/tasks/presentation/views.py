@@ -1,28 +1,37 @@
 import logging
 
+from django.conf import settings
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from middlewares.auth_middleware import check_user_is_connected
-from serializers import TaskSerializer, TaskTimeEntrySerializer
-from utils.user_utils import get_connected_user
+from serializers import TaskListSerializer, TaskSerializer, TaskTimeEntrySerializer
+from webapp.shared import exceptions
+from webapp.shared.async_api_view import AsyncAPIView
+from webapp.shared.conditional import conditional_on_owner_data
+from webapp.shared.streaming import csv_lines, ndjson_lines, streaming_response
 from webapp.projects.infrastructure.repositories import ProjectRepository
 from webapp.tasks.application.use_cases import (
     CreateTaskUseCase,
     EditTaskUseCase,
+    ExportUseCase,
     ListTasksUseCase,
     StartTimerUseCase,
     StopTimerUseCase,
+    TimeReportUseCase,
+    WeeklyReportUseCase,
 )
 from webapp.tasks.infrastructure.repositories import TaskRepository, TimeEntryRepository
 from webapp.tasks.presentation.serializers import (
     CreateTaskSerializer,
     EditTaskSerializer,
+    ExportSerializer,
     StartTimerSerializer,
+    TimeReportSerializer,
+    WeeklyReportSerializer,
 )
-from webapp.users.infrastructure.repositories import UserRepository
 
 
 class CreateTaskAPIView(APIView):
@@ -52,13 +61,13 @@ class CreateTaskAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        connected_user = get_connected_user(request)
+        connected_user = request.connected_user
         validated_data = serialized.validated_data
         use_case = CreateTaskUseCase(TaskRepository(), ProjectRepository())
 
         try:
             created_task = use_case.execute(
-                user_id=connected_user.id,
+                user=connected_user,
                 project_id=validated_data["project_id"],
                 title=validated_data["title"],
                 description=validated_data.get("description"),
@@ -78,6 +87,96 @@ class CreateTaskAPIView(APIView):
             )
 
 
+class BulkCreateTaskAPIView(APIView):
+    serializer_class = CreateTaskSerializer
+
+    @swagger_auto_schema(
+        operation_id="bulk_create_tasks",
+        operation_description="""
+        Endpoint for the creation of a batch of tasks, e.g. by importers.
+        The body is a list of tasks (same fields as the task creation), all the
+        tasks are validated before any is created.
+
+        The response has one result per task, in the order of the body:
+        ***task***: The created task
+        ***error***: Why the task was not created (unknown or not owned project)
+
+        The status is 201 when every task was created, 207 when only some were and
+        400 when none was.
+        """,
+        operation_summary="Create a batch of tasks",
+        request_body=CreateTaskSerializer(many=True),
+        responses={
+            201: '{"created": 2, "failed": 0, "results": [{"index": 0, "task": {...}}, '
+            '{"index": 1, "task": {...}}]}',
+            207: '{"created": 1, "failed": 1, "results": [{"index": 0, "task": {...}}, '
+            '{"index": 1, "error": "Project not found"}]}',
+            400: '{"error": "Invalid data provided for tasks creation", "details": [...]} '
+            'or {"created": 0, "failed": 1, "results": [{"index": 0, "error": ...}]}',
+            404: '{"error": "You are not connected !"}',
+            500: '{"error": "Tasks creation failed"}',
+        },
+        tags=["Tasks"],
+        security=[{"Bearer": []}],
+    )
+    @check_user_is_connected
+    def post(self, request, *args, **kwargs):
+        serialized = self.serializer_class(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.TASK_BULK_CREATE_MAX_SIZE,
+        )
+        if not serialized.is_valid():
+            logging.exception(serialized.errors)
+            return Response(
+                {
+                    "error": "Invalid data provided for tasks creation",
+                    "details": serialized.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        connected_user = request.connected_user
+        use_case = CreateTaskUseCase(TaskRepository(), ProjectRepository())
+
+        try:
+            results = use_case.execute_batch(
+                user=connected_user, tasks=serialized.validated_data
+            )
+
+            created = 0
+            for result in results:
+                if "task" in result:
+                    result["task"] = TaskSerializer(result["task"]).data
+                    created += 1
+
+            if created == len(results):
+                response_status = status.HTTP_201_CREATED
+
+            elif created:
+                response_status = status.HTTP_207_MULTI_STATUS
+
+            else:
+                response_status = status.HTTP_400_BAD_REQUEST
+
+            return Response(
+                {
+                    "created": created,
+                    "failed": len(results) - created,
+                    "results": results,
+                },
+                status=response_status,
+            )
+
+        except Exception as e:
+            logging.exception(f"Error during tasks creation: {e}")
+            return Response(
+                {"error": "Tasks creation failed"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class RetrievePaginatedTasksAPIView(APIView):
 
     @swagger_auto_schema(
@@ -90,16 +189,27 @@ class RetrievePaginatedTasksAPIView(APIView):
         ## URL PARAMETERS
         ***page***: The current page of the pagination (default = 1)
         ***size***: The size of returned items (default = 5)
-        ***query***: The user input for search
+        ***query***: The user input for search, results are ordered by relevance (except
+        in cursor pagination)
         ***status***: The status value to filtering
         ***project_id***: The project where to filtering
+        ***cursor***: Switch to cursor pagination, empty for the first page, then the
+        returned **next_cursor** (replaces **page**, **total** is not computed)
+        ***with_total***: Set to true to compute **total** in cursor pagination
+        ***approximate_total***: Set to true to cap the count, **total** is then
+        reported as e.g. "1000+" for very large results
+        ***fields***: Comma separated fields of the returned tasks (default = all),
+        e.g. "id,title". Fields not requested are neither read nor computed
         
         ## Example
         GET {BASE_URL}/api/tasks/list/?page=1&size=5&query=text&status=done
+        GET {BASE_URL}/api/tasks/list/?cursor=&size=5
         """,
         operation_summary="Retrieve paginated tasks",
         responses={
             200: TaskSerializer(),
+            304: "Unchanged since the ETag (If-None-Match) or date (If-Modified-Since)",
+            400: '{"error": "Unknown fields: ..."}',
             404: '{"error": "You are not connected !"}',
             500: '{"error": "Tasks listing failed"}',
         },
@@ -107,12 +217,46 @@ class RetrievePaginatedTasksAPIView(APIView):
         security=[{"Bearer": []}],
     )
     @check_user_is_connected
+    @conditional_on_owner_data
     def get(self, request, *args, **kwargs):
+        params = self._listing_params(request)
+        connected_user = request.connected_user
+        use_case = ListTasksUseCase(ProjectRepository(), TaskRepository())
+
+        try:
+            list_serializer = TaskListSerializer.select(params.pop("fields"))
+            paginated_tasks = use_case.execute(
+                user=connected_user, **params, fields=list_serializer.values()
+            )
+
+            paginated_tasks.update(
+                {"tasks": list_serializer(paginated_tasks["tasks"]).data}
+            )
+
+            return Response(paginated_tasks, status=status.HTTP_200_OK)
+
+        except exceptions.ValidationException as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logging.exception(f"Error during tasks listing: {e}")
+            return Response(
+                {"error": "Tasks listing failed"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    @staticmethod
+    def _listing_params(request):
+        """Read the listing parameters of the URL"""
         page = 1
         size = 5
         query = ""
         filter_status = None
         project_id = None
+        cursor = None
+        with_total = False
+        approximate_total = False
+        fields = []
         if "page" in request.GET and request.GET["page"].strip() != "":
             page = int(request.GET["page"])
 
@@ -128,27 +272,59 @@ class RetrievePaginatedTasksAPIView(APIView):
         if "project_id" in request.GET and request.GET["project_id"].strip() != "":
             project_id = request.GET["project_id"]
 
-        connected_user = get_connected_user(request)
-        use_case = ListTasksUseCase(
-            ProjectRepository(), UserRepository(), TaskRepository()
-        )
+        if "cursor" in request.GET:
+            cursor = request.GET["cursor"].strip()
+
+        if "with_total" in request.GET:
+            with_total = request.GET["with_total"].strip().lower() == "true"
+
+        if "approximate_total" in request.GET:
+            approximate_total = request.GET["approximate_total"].strip().lower() == "true"
+
+        if "fields" in request.GET:
+            fields = [
+                name.strip() for name in request.GET["fields"].split(",") if name.strip()
+            ]
+
+        return {
+            "page": page,
+            "size": size,
+            "query": query,
+            "status": filter_status,
+            "project_id": project_id,
+            "cursor": cursor,
+            "with_total": with_total,
+            "approximate_total": approximate_total,
+            "fields": fields,
+        }
+
+
+class AsyncRetrievePaginatedTasksAPIView(AsyncAPIView, RetrievePaginatedTasksAPIView):
+    """Async variant of the tasks listing, served under ASGI"""
+
+    @swagger_auto_schema(**RetrievePaginatedTasksAPIView.get._swagger_auto_schema)
+    @check_user_is_connected
+    @conditional_on_owner_data
+    async def get(self, request, *args, **kwargs):
+        params = self._listing_params(request)
+        connected_user = request.connected_user
+        use_case = ListTasksUseCase(ProjectRepository(), TaskRepository())
 
         try:
-            paginated_tasks = use_case.execute(
-                user_id=connected_user.id,
-                page=page,
-                size=size,
-                query=query,
-                status=filter_status,
-                project_id=project_id,
+            list_serializer = TaskListSerializer.select(params.pop("fields"))
+            paginated_tasks = await use_case.aexecute(
+                user=connected_user, **params, fields=list_serializer.values()
             )
 
             paginated_tasks.update(
-                {"tasks": TaskSerializer(paginated_tasks["tasks"], many=True).data}
+                {"tasks": list_serializer(paginated_tasks["tasks"]).data}
             )
 
             return Response(paginated_tasks, status=status.HTTP_200_OK)
 
+        except exceptions.ValidationException as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         except Exception as e:
             logging.exception(f"Error during tasks listing: {e}")
             return Response(
@@ -184,13 +360,13 @@ class EditTaskAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        connected_user = get_connected_user(request)
+        connected_user = request.connected_user
         validated_data = serialized.validated_data
-        use_case = EditTaskUseCase(UserRepository(), TaskRepository())
+        use_case = EditTaskUseCase(TaskRepository())
 
         try:
             updated_project = use_case.execute(
-                user_id=connected_user.id,
+                user=connected_user,
                 task_id=id,
                 title=validated_data.get("title"),
                 description=validated_data.get("description"),
@@ -222,6 +398,8 @@ class StartTaskTimerAPIView(APIView):
             201: TaskTimeEntrySerializer(),
             400: '{"error": "Invalid data provided for the start timer of a task"}',
             404: '{"error": "You are not connected !"}',
+            409: '{"error": "Task already has an active timer"} or '
+            '{"error": "Another timer of the user was started concurrently"}',
             500: '{"error": "Start timer of the task failed"}',
         },
         tags=["Tasks"],
@@ -237,15 +415,13 @@ class StartTaskTimerAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        connected_user = get_connected_user(request)
+        connected_user = request.connected_user
         validated_data = serialized.validated_data
-        use_case = StartTimerUseCase(
-            TaskRepository(), TimeEntryRepository(), UserRepository()
-        )
+        use_case = StartTimerUseCase(TaskRepository(), TimeEntryRepository())
 
         try:
             started_timer = use_case.execute(
-                user_id=connected_user.id, task_id=validated_data["task_id"]
+                user=connected_user, task_id=validated_data["task_id"]
             )
 
             return Response(
@@ -253,6 +429,9 @@ class StartTaskTimerAPIView(APIView):
                 status=status.HTTP_201_CREATED,
             )
 
+        except exceptions.TimerException as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+
         except Exception as e:
             logging.exception(f"Error during the start timer of a task: {e}")
             return Response(
@@ -288,15 +467,13 @@ class StopTaskTimerAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        connected_user = get_connected_user(request)
+        connected_user = request.connected_user
         validated_data = serialized.validated_data
-        use_case = StopTimerUseCase(
-            TaskRepository(), TimeEntryRepository(), UserRepository()
-        )
+        use_case = StopTimerUseCase(TaskRepository(), TimeEntryRepository())
 
         try:
             task_duration = use_case.execute(
-                user_id=connected_user.id, task_id=validated_data["task_id"]
+                user=connected_user, task_id=validated_data["task_id"]
             )
 
             return Response(task_duration, status=status.HTTP_200_OK)
@@ -307,3 +484,222 @@ class StopTaskTimerAPIView(APIView):
                 {"error": "Stop timer of the task failed"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class WeeklyReportAPIView(APIView):
+    serializer_class = WeeklyReportSerializer
+
+    @swagger_auto_schema(
+        operation_id="weekly_report",
+        operation_description="""
+        Endpoint for the weekly time tracking report of the connected user.
+        This endpoint will return the **total_time** of the week and the
+        **total_time** and **entries_count** of each of its 7 **days** (in minutes).
+
+        ## URL PARAMETERS
+        ***week_start***: The first day of the week, YYYY-MM-DD (default = monday of
+        the current week)
+        ***tz***: The time zone of the days, e.g. Europe/Paris (default = UTC)
+        ***include_entries***: Set to true to also return the time entries of each day
+
+        ## Example
+        GET {BASE_URL}/api/tasks/weekly-report?week_start=2025-09-01&tz=Europe/Paris
+        """,
+        operation_summary="Retrieve the weekly time report",
+        query_serializer=WeeklyReportSerializer(),
+        responses={
+            200: "Weekly time report",
+            400: '{"error": "Invalid parameters provided for the weekly report"}',
+            404: '{"error": "You are not connected !"}',
+            500: '{"error": "Weekly report failed"}',
+        },
+        tags=["Tasks"],
+        security=[{"Bearer": []}],
+    )
+    @check_user_is_connected
+    def get(self, request, *args, **kwargs):
+        serialized = self.serializer_class(data=request.GET)
+        if not serialized.is_valid():
+            logging.exception(serialized.errors)
+            return Response(
+                {"error": "Invalid parameters provided for the weekly report"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        connected_user = request.connected_user
+        validated_data = serialized.validated_data
+        use_case = WeeklyReportUseCase(TimeEntryRepository())
+
+        try:
+            weekly_report = use_case.execute(
+                user=connected_user,
+                week_start=validated_data.get("week_start"),
+                tz_name=validated_data.get("tz"),
+                include_entries=validated_data["include_entries"],
+            )
+
+            return Response(weekly_report, status=status.HTTP_200_OK)
+
+        except exceptions.ValidationException as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logging.exception(f"Error during the weekly report: {e}")
+            return Response(
+                {"error": "Weekly report failed"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class TimeReportAPIView(APIView):
+    serializer_class = TimeReportSerializer
+
+    @swagger_auto_schema(
+        operation_id="time_report",
+        operation_description="""
+        Endpoint for the time report of the connected user over a date range.
+        This endpoint will return **rows** with the **total_time** (in minutes) and
+        the **entries_count** of each **period**, and of each project or task of the
+        period with **group_by**.
+        At most TIME_REPORT_MAX_ROWS rows are returned, **truncated** tells whether
+        there were more: longer reports have to be streamed.
+
+        ## URL PARAMETERS
+        ***start_date*** and ***end_date***: The date range, YYYY-MM-DD, both included
+        (default = the last 30 days)
+        ***period***: day, week or month (default = day)
+        ***group_by***: project or task (default = no grouping)
+        ***tz***: The time zone of the periods, e.g. Europe/Paris (default = UTC)
+        ***stream***: Set to true to stream every row as newline-delimited JSON
+
+        ## Example
+        GET {BASE_URL}/api/tasks/time-report?start_date=2025-01-01&period=month&group_by=project
+        """,
+        operation_summary="Retrieve a time report",
+        query_serializer=TimeReportSerializer(),
+        responses={
+            200: "Time report",
+            400: '{"error": "Invalid parameters provided for the time report"}',
+            404: '{"error": "You are not connected !"}',
+            500: '{"error": "Time report failed"}',
+        },
+        tags=["Tasks"],
+        security=[{"Bearer": []}],
+    )
+    @check_user_is_connected
+    def get(self, request, *args, **kwargs):
+        serialized = self.serializer_class(data=request.GET)
+        if not serialized.is_valid():
+            logging.exception(serialized.errors)
+            return Response(
+                {"error": "Invalid parameters provided for the time report"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        connected_user = request.connected_user
+        validated_data = serialized.validated_data
+        use_case = TimeReportUseCase(TimeEntryRepository())
+
+        try:
+            time_report = use_case.execute(
+                user=connected_user,
+                start_date=validated_data.get("start_date"),
+                end_date=validated_data.get("end_date"),
+                period=validated_data["period"],
+                group_by=validated_data.get("group_by"),
+                tz_name=validated_data.get("tz"),
+                max_rows=settings.TIME_REPORT_MAX_ROWS,
+                stream=validated_data["stream"],
+            )
+
+            if validated_data["stream"]:
+                return streaming_response(
+                    request,
+                    ndjson_lines(time_report["rows"]),
+                    content_type="application/x-ndjson",
+                )
+
+            return Response(time_report, status=status.HTTP_200_OK)
+
+        except exceptions.ValidationException as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logging.exception(f"Error during the time report: {e}")
+            return Response(
+                {"error": "Time report failed"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class ExportAPIView(APIView):
+    serializer_class = ExportSerializer
+
+    @swagger_auto_schema(
+        operation_id="export",
+        operation_description="""
+        Endpoint for exporting every task or every time entry of the connected user.
+        The rows are streamed from the database as they are read, whatever their
+        number.
+
+        ## URL PARAMETERS
+        ***resource***: tasks or time-entries
+        ***output***: csv or ndjson (newline-delimited JSON) (default = csv)
+
+        ## Example
+        GET {BASE_URL}/api/tasks/export/time-entries?output=ndjson
+        """,
+        operation_summary="Export tasks or time entries",
+        query_serializer=ExportSerializer(),
+        responses={
+            200: "Streamed CSV or NDJSON rows",
+            400: '{"error": "Invalid parameters provided for the export"}',
+            404: '{"error": "You are not connected !"}',
+            500: '{"error": "Export failed"}',
+        },
+        tags=["Tasks"],
+        security=[{"Bearer": []}],
+    )
+    @check_user_is_connected
+    def get(self, request, resource, *args, **kwargs):
+        serialized = self.serializer_class(data=request.GET)
+        if not serialized.is_valid():
+            logging.exception(serialized.errors)
+            return Response(
+                {"error": "Invalid parameters provided for the export"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        connected_user = request.connected_user
+        output = serialized.validated_data["output"]
+        use_case = ExportUseCase(TaskRepository(), TimeEntryRepository())
+
+        try:
+            columns, rows = use_case.execute(user=connected_user, resource=resource)
+
+            if output == "ndjson":
+                response = streaming_response(
+                    request,
+                    ndjson_lines(dict(zip(columns, row)) for row in rows),
+                    content_type="application/x-ndjson",
+                )
+
+            else:
+                response = streaming_response(
+                    request, csv_lines(columns, rows), content_type="text/csv"
+                )
+
+            response["Content-Disposition"] = (
+                f'attachment; filename="{resource}.{output}"'
+            )
+            return response
+
+        except exceptions.ValidationException as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logging.exception(f"Error during the export: {e}")
+            return Response(
+                {"error": "Export failed"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
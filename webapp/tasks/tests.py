@@ -0,0 +1,416 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app_models.models.constant import TaskStatus
+from app_models.models.dashboard_rollup import DashboardRollup
+from app_models.models.project import Project
+from app_models.models.task import Task
+from app_models.models.time_entry import TimeEntry
+from webapp.projects.infrastructure.repositories import DashboardRollupRepository
+from webapp.shared.infrastructure.data_versions import get_owner_data_version
+from webapp.shared.pagination import decode_cursor, encode_cursor
+from webapp.tasks.infrastructure.repositories import (
+    TaskRepository,
+    TimeEntryRepository,
+)
+
+
+class TimeEntryUpdateTestCase(TestCase):
+    """Spent time counters when a time entry is updated"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="tester", password="password")
+        self.repository = TimeEntryRepository()
+        self.first_project = self._create_project("First project")
+        self.second_project = self._create_project("Second project")
+        self.first_task = Task.objects.create(title="First", project=self.first_project)
+        self.second_task = Task.objects.create(
+            title="Second", project=self.second_project
+        )
+
+        start_time = timezone.now() - timedelta(hours=2)
+        self.entry = self.repository.create(
+            {
+                "task": self.first_task,
+                "user": self.user,
+                "owner": self.user,
+                "start_time": start_time,
+                "end_time": start_time + timedelta(minutes=30),
+                "duration": 30,
+                "is_active": False,
+            }
+        )
+
+    def _create_project(self, title):
+        project = Project.objects.create(title=title, owner=self.user)
+        DashboardRollupRepository().create_for_project(project)
+        return project
+
+    def _assert_spent_time(self, task, minutes):
+        task.refresh_from_db()
+        self.assertEqual(task.spent_time, minutes)
+        rollup = DashboardRollup.objects.get(project_id=task.project_id)
+        self.assertEqual(rollup.total_spent_time, minutes)
+
+    def test_duration_change(self):
+        self.repository.update(self.entry, {"duration": 45})
+
+        self._assert_spent_time(self.first_task, 45)
+
+    def test_move_to_another_task(self):
+        self.repository.update(self.entry, {"task": self.second_task, "duration": 45})
+
+        self._assert_spent_time(self.first_task, 0)
+        self._assert_spent_time(self.second_task, 45)
+
+    def test_move_to_a_task_of_another_owner(self):
+        other_user = User.objects.create_user(username="other", password="password")
+        other_project = Project.objects.create(title="Other project", owner=other_user)
+        DashboardRollupRepository().create_for_project(other_project)
+        other_task = Task.objects.create(title="Other", project=other_project)
+        previous_version = get_owner_data_version(other_user.id)
+
+        self.repository.update(self.entry, {"task": other_task})
+
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.owner_id, other_user.id)
+        self.assertNotEqual(get_owner_data_version(other_user.id), previous_version)
+        self._assert_spent_time(self.first_task, 0)
+        self._assert_spent_time(other_task, 30)
+
+    def test_move_to_another_task_of_the_same_project(self):
+        other_task = Task.objects.create(title="Other", project=self.first_project)
+
+        self.repository.update(self.entry, {"task": other_task})
+
+        self.first_task.refresh_from_db()
+        other_task.refresh_from_db()
+        self.assertEqual(self.first_task.spent_time, 0)
+        self.assertEqual(other_task.spent_time, 30)
+        rollup = DashboardRollup.objects.get(project=self.first_project)
+        self.assertEqual(rollup.total_spent_time, 30)
+
+
+class TaskUpdateTestCase(TestCase):
+    """Task edits racing the writes of the time entries"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="tester", password="password")
+        self.repository = TaskRepository()
+        self.project = Project.objects.create(title="Project", owner=self.user)
+        DashboardRollupRepository().create_for_project(self.project)
+        self.task = self.repository.create(
+            {"title": "Task", "project": self.project, "estimated_time": 60}
+        )
+
+    def _add_time_entry(self, minutes):
+        start_time = timezone.now() - timedelta(hours=2)
+        TimeEntryRepository().create(
+            {
+                "task": self.task,
+                "user": self.user,
+                "owner": self.user,
+                "start_time": start_time,
+                "end_time": start_time + timedelta(minutes=minutes),
+                "duration": minutes,
+                "is_active": False,
+            }
+        )
+
+    def test_spent_time_added_after_the_load_is_kept(self):
+        task = self.repository.get_by_id(self.task.id)
+        self._add_time_entry(30)
+
+        self.repository.update(task, {"title": "Renamed"})
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Renamed")
+        self.assertEqual(self.task.spent_time, 30)
+
+    def test_rollup_follows_the_current_task_values(self):
+        stale_task = self.repository.get_by_id(self.task.id)
+        self.repository.update(
+            self.repository.get_by_id(self.task.id), {"status": TaskStatus.DONE}
+        )
+        self._add_time_entry(30)
+
+        self.repository.update(stale_task, {"estimated_time": 90})
+
+        self.assertEqual(stale_task.spent_time, 30)
+        self.assertEqual(DashboardRollupRepository().rebuild(fix=False), [])
+        self.repository.delete(stale_task)
+        self.assertEqual(DashboardRollupRepository().rebuild(fix=False), [])
+
+
+class TimerTestCase(TestCase):
+    """Timers: one active timer per owner, start, stop and spent time reconciliation"""
+
+    def setUp(self):
+        # The user cache is shared between the tests, whose user IDs are reused
+        cache.clear()
+        self.user = User.objects.create_user(username="tester", password="password")
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.repository = TimeEntryRepository()
+        self.project = Project.objects.create(title="Project", owner=self.user)
+        DashboardRollupRepository().create_for_project(self.project)
+        self.first_task = Task.objects.create(title="First", project=self.project)
+        self.second_task = Task.objects.create(title="Second", project=self.project)
+
+    def _start(self, task):
+        return self.client.post(
+            "/api/tasks/start-timer", {"task_id": task.id}, format="json"
+        )
+
+    def _backdate_active_timer(self, minutes):
+        TimeEntry.objects.filter(owner=self.user, is_active=True).update(
+            start_time=F("start_time") - timedelta(minutes=minutes)
+        )
+
+    def _active_task_ids(self):
+        return list(
+            TimeEntry.objects.filter(owner=self.user, is_active=True).values_list(
+                "task_id", flat=True
+            )
+        )
+
+    def _assert_spent_time(self, task, minutes):
+        task.refresh_from_db()
+        self.assertEqual(task.spent_time, minutes)
+
+    def test_start_twice_on_the_same_task(self):
+        self.assertEqual(
+            self._start(self.first_task).status_code, status.HTTP_201_CREATED
+        )
+
+        response = self._start(self.first_task)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.json(), {"error": "Task already has an active timer"})
+        self.assertEqual(self._active_task_ids(), [self.first_task.id])
+
+    def test_start_on_a_second_task_stops_the_running_timer(self):
+        self._start(self.first_task)
+        self._backdate_active_timer(30)
+
+        response = self._start(self.second_task)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._active_task_ids(), [self.second_task.id])
+        self._assert_spent_time(self.first_task, 30)
+        rollup = DashboardRollup.objects.get(project=self.project)
+        self.assertEqual(rollup.total_spent_time, 30)
+
+    def test_concurrent_start_on_another_task(self):
+        self._start(self.first_task)
+
+        # The timer started concurrently is not seen by the stop of the other timers
+        with mock.patch.object(TimeEntryRepository, "stop_active_timers_for_user"):
+            response = self._start(self.second_task)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.json(),
+            {"error": "Another timer of the user was started concurrently"},
+        )
+        self.assertEqual(self._active_task_ids(), [self.first_task.id])
+
+    def test_one_active_timer_per_owner(self):
+        self.repository.start_timer(self.user, self.first_task, timezone.now())
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TimeEntry.objects.create(
+                user=self.user,
+                task=self.second_task,
+                start_time=timezone.now(),
+                is_active=True,
+            )
+
+    def test_stop(self):
+        self._start(self.first_task)
+        self._backdate_active_timer(45)
+
+        response = self.client.post(
+            "/api/tasks/stop-timer", {"task_id": self.first_task.id}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"task": "First", "duration": 45})
+        self.assertEqual(self._active_task_ids(), [])
+        self._assert_spent_time(self.first_task, 45)
+
+    def test_stop_active_timers_for_user(self):
+        self.assertEqual(self.repository.stop_active_timers_for_user(self.user), 0)
+        self.repository.start_timer(self.user, self.first_task, timezone.now())
+        self._backdate_active_timer(20)
+
+        self.assertEqual(self.repository.stop_active_timers_for_user(self.user), 1)
+
+        entry = TimeEntry.objects.get(task=self.first_task)
+        self.assertFalse(entry.is_active)
+        self.assertEqual(entry.duration, 20)
+        self._assert_spent_time(self.first_task, 20)
+        rollup = DashboardRollup.objects.get(project=self.project)
+        self.assertEqual(rollup.total_spent_time, 20)
+
+    def test_reconcile_spent_time(self):
+        start_time = timezone.now() - timedelta(hours=1)
+        entry = self.repository.create(
+            {
+                "task": self.first_task,
+                "user": self.user,
+                "owner": self.user,
+                "start_time": start_time,
+                "end_time": start_time + timedelta(minutes=50),
+                "duration": 50,
+                "is_active": False,
+            }
+        )
+        # Drift: a wrong duration and a wrong spent time
+        TimeEntry.objects.filter(id=entry.id).update(duration=10)
+        Task.objects.filter(id=self.second_task.id).update(spent_time=99)
+
+        drifted = self.repository.reconcile_spent_time(fix=False)
+
+        self.assertEqual(
+            drifted, ([entry.id], sorted([self.first_task.id, self.second_task.id]))
+        )
+        self._assert_spent_time(self.second_task, 99)
+
+        self.repository.reconcile_spent_time()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.duration, 50)
+        self._assert_spent_time(self.first_task, 50)
+        self._assert_spent_time(self.second_task, 0)
+        self.assertEqual(self.repository.reconcile_spent_time(fix=False), ([], []))
+        self.assertEqual(DashboardRollupRepository().rebuild(fix=False), [])
+
+
+class TaskCursorPaginationTestCase(TestCase):
+    """Keyset pagination of the task list on (created_at, id)"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tester", password="password")
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        project = Project.objects.create(title="Project", owner=self.user)
+        for index in range(7):
+            Task.objects.create(title=f"Task {index}", project=project)
+
+        # Five tasks share their creation time: the ID breaks the tie
+        created_at = timezone.now() - timedelta(days=1)
+        tasks = Task.objects.order_by("id")
+        Task.objects.filter(id__in=list(tasks.values_list("id", flat=True)[:5])).update(
+            created_at=created_at
+        )
+        self.expected_ids = list(
+            Task.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def _list(self, **params):
+        return self.client.get("/api/tasks/list/", params)
+
+    def test_cursor_round_trip(self):
+        created_at = timezone.now()
+
+        self.assertEqual(
+            decode_cursor(encode_cursor(created_at, "abc")), (created_at, "abc")
+        )
+
+    def test_pages_have_no_duplicates_nor_gaps(self):
+        listed_ids = []
+        cursor = ""
+        while True:
+            response = self._list(cursor=cursor, size=3)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.json()
+            listed_ids.extend(task["id"] for task in page["tasks"])
+            if not page["more"]:
+                self.assertIsNone(page["next_cursor"])
+                break
+
+            cursor = page["next_cursor"]
+
+        self.assertEqual(listed_ids, self.expected_ids)
+
+    def test_invalid_cursor(self):
+        for cursor in ("not-a-cursor", encode_cursor(timezone.now(), "id")[:-4], "WzFd"):
+            response = self._list(cursor=cursor)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.json(), {"error": "Invalid pagination cursor"})
+
+    def test_total(self):
+        response = self._list(cursor="", size=2, with_total="true")
+
+        self.assertEqual(response.json()["total"], 7)
+
+    def test_approximate_total_cap(self):
+        with mock.patch("webapp.shared.pagination.APPROXIMATE_COUNT_LIMIT", 5):
+            capped = self._list(cursor="", with_total="true", approximate_total="true")
+        with mock.patch("webapp.shared.pagination.APPROXIMATE_COUNT_LIMIT", 10):
+            exact = self._list(cursor="", with_total="true", approximate_total="true")
+
+        self.assertEqual(capped.json()["total"], "5+")
+        self.assertEqual(exact.json()["total"], 7)
+
+
+class BulkCreateTaskTestCase(TestCase):
+    """Status of the bulk creation, by the number of created tasks"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tester", password="password")
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.project = Project.objects.create(title="Project", owner=self.user)
+        DashboardRollupRepository().create_for_project(self.project)
+
+    def _bulk_create(self, *project_ids):
+        return self.client.post(
+            "/api/tasks/bulk-create",
+            [
+                {"title": f"Task {index}", "project_id": project_id}
+                for index, project_id in enumerate(project_ids)
+            ],
+            format="json",
+        )
+
+    def test_every_task_created(self):
+        response = self._bulk_create(self.project.id, self.project.id)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["created"], 2)
+
+    def test_some_tasks_created(self):
+        response = self._bulk_create(self.project.id, "unknown")
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertIn("error", response.json()["results"][1])
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_no_task_created(self):
+        response = self._bulk_create("unknown", "unknown")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["failed"], 2)
+        self.assertFalse(Task.objects.exists())
@@ -1,48 +1,43 @@
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.db import transaction
 
+from utils.cache import SharedTTLCache
+from webapp.shared.infrastructure.data_versions import notify_owner_data_changed
 from webapp.shared.infrastructure.repositories import (
     BaseRepository,
     UserRepositoryInterface,
 )
 
+# Cache of user rows in the Django cache: with a shared backend, the invalidation of
+# a deactivated user reaches every worker, which stop authenticating it at once
+user_cache = SharedTTLCache("user", ttl=settings.USER_CACHE_TTL)
+
 
 class UserRepository(BaseRepository, UserRepositoryInterface):
     """Repository for User entity operations"""
 
     def get_by_id(self, id):
         """Get user by ID"""
-        try:
-            return User.objects.get(id=id)
-
-        except User.DoesNotExist:
-            return None
+        return self._get_cached("id", id)
 
     def get_by_username(self, username):
         """Get user by username"""
-        try:
-            return User.objects.get(username=username)
-
-        except User.DoesNotExist:
-            return None
+        return self._get_cached("username", username)
 
     def get_by_email(self, email):
         """Get user by email"""
-        try:
-            return User.objects.get(email=email)
-
-        except User.DoesNotExist:
-            return None
+        return self._get_cached("email", email)
 
     def exists_by_username(self, username):
         """Check if user exists by username"""
-        return User.objects.filter(username=username).exists()
+        return self._exists_cached("username", username)
 
     def exists_by_email(self, email):
         """Check if user exists by email"""
-        return User.objects.filter(email=email).exists()
-    
+        return self._exists_cached("email", email)
+
     def check_password(self, username, password):
         """Check if password match the user email"""
         return authenticate(username=username, password=password) is not None
@@ -57,19 +52,79 @@ class UserRepository(BaseRepository, UserRepositoryInterface):
             last_name=data.get("last_name", ""),
             password=data["password"],
         )
+        self._invalidate(user)
         return user
 
     def update(self, user, data):
         """Update user data"""
+        # Keys of the previous username/email must be dropped too
+        self._invalidate(user)
         for field, value in data.items():
             if hasattr(user, field):
                 setattr(user, field, value)
 
         user.save()
+        self._invalidate(user)
+        # The username is part of the projects of the user
+        notify_owner_data_changed(user.id)
         return user
 
     def delete(self, user):
         """Delete user (soft delete by deactivating)"""
         user.is_active = False
         user.save()
+        self._invalidate(user)
         return user
+
+    @staticmethod
+    def cache_stats():
+        """Get the hit/miss counters of the user cache, for monitoring"""
+        return user_cache.stats()
+
+    def _get_cached(self, field, value):
+        """Get a user by a unique field, reading through the user cache"""
+        key = (field, str(value))
+        # Every read unpickles a new instance: callers may mutate it
+        user = user_cache.get(key)
+        if user is None:
+            try:
+                user = User.objects.get(**{field: value})
+
+            except User.DoesNotExist:
+                return None
+
+            entries = {
+                ("id", str(user.id)): user,
+                ("username", user.username): user,
+                ("exists", "username", user.username): True,
+            }
+            if field == "email":
+                entries[key] = user
+                entries[("exists", "email", user.email)] = True
+
+            user_cache.set_many(entries)
+
+        return user
+
+    def _exists_cached(self, field, value):
+        """Check if a user exists by a field; only positive answers are cached"""
+        key = ("exists", field, value)
+        if user_cache.get(key):
+            return True
+
+        exists = User.objects.filter(**{field: value}).exists()
+        if exists:
+            user_cache.set_many({key: True})
+
+        return exists
+
+    @staticmethod
+    def _invalidate(user):
+        """Drop every cache entry about a user"""
+        user_cache.delete(
+            ("id", str(user.id)),
+            ("username", user.username),
+            ("email", user.email),
+            ("exists", "username", user.username),
+            ("exists", "email", user.email),
+        )